@@ -0,0 +1,285 @@
+"""Environment throughput benchmark.
+
+Runs every backend x obs_mode x N_ENVS combination in a fresh process and
+writes steps/sec, reset and step latencies, startup time and peak RSS to a
+JSON file, so runs can be compared between commits:
+
+    python benchmark.py --backends sim browser --n-envs 1 4 16 --steps 500
+
+Browser runs are also repeated for each ``--browser-pool``, ``--pages-per-browser``
+and ``--assets`` value, e.g. to compare pool startup and RSS:
+
+    python benchmark.py --backends browser --n-envs 8 --browser-pool 0 1 --pages-per-browser 2 8
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import psutil
+
+# Raw obstacle x position (first obstacle) under which the scripted policy jumps
+JUMP_DISTANCE = 100.0
+TREX_X = 50.0
+
+
+class PeakRSSSampler:
+    """Samples the RSS of this process and all its children (e.g. Chromium) in the background."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.peak = 0
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def sample(self):
+        rss = 0
+        for process in [self._process] + self._process.children(recursive=True):
+            try:
+                rss += process.memory_info().rss
+            except psutil.Error:
+                pass  # Process exited between listing and sampling
+        self.peak = max(self.peak, rss)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self.sample()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+        return self.peak
+
+
+def first_obstacle_x(obs, obs_mode):
+    """Raw x of the first obstacle for each env in a batched observation."""
+    if obs_mode == "flat":
+        return obs[:, 8]
+    return obs["obstacles"][:, 0]
+
+
+def choose_actions(obs, obs_mode, policy, rng, n_envs):
+    """Random or scripted (jump when an obstacle is close) actions for a batch."""
+    if policy == "random" or obs_mode == "pixels":
+        return rng.integers(0, 2, size=n_envs)
+    gap = first_obstacle_x(obs, obs_mode) - TREX_X
+    return ((gap > 0) & (gap < JUMP_DISTANCE)).astype(np.int64)
+
+
+def make_env(config):
+    """Build the env the way train.py does: gym.make for one env, make_dino_vec_env otherwise."""
+    import dino_env  # Registers DinoRun-v0
+    import gymnasium as gym
+    from dino_vec_env import make_dino_vec_env
+
+    env_kwargs = {
+        "backend": config["backend"],
+        "obs_mode": config["obs_mode"],
+        "frame_skip": config["frame_skip"],
+        "virtual_time": config["virtual_time"],
+        "draw": config["draw"],
+        "headless": config["headless"],
+        "max_steps": config["max_steps"],
+        "browser_pool": config["browser_pool"],
+        "pages_per_browser": config["pages_per_browser"],
+        "assets": config["assets"],
+    }
+    if config["api"] == "gym":
+        return gym.make("DinoRun-v0", **env_kwargs)
+    return make_dino_vec_env(config["n_envs"], env_kwargs=env_kwargs, seed=config["seed"],
+                             vec_env=config["vec_env"])
+
+
+def run_config(config):
+    """Benchmark one configuration; meant to run in its own process."""
+    sampler = PeakRSSSampler().start()
+    rng = np.random.default_rng(config["seed"])
+    n_envs = config["n_envs"]
+    single = config["api"] == "gym"
+
+    started = time.perf_counter()
+    env = make_env(config)
+    if single:
+        obs, _ = env.reset(seed=config["seed"])
+    else:
+        obs = env.reset()
+    # Browser envs launch lazily, so startup includes the first reset
+    startup_s = time.perf_counter() - started
+
+    try:
+        reset_latencies = []
+        for _ in range(config["resets"]):
+            started = time.perf_counter()
+            obs = env.reset()[0] if single else env.reset()
+            reset_latencies.append(time.perf_counter() - started)
+
+        step_latencies = np.zeros(config["steps"])
+        episodes = 0
+        loop_started = time.perf_counter()
+        for i in range(config["steps"]):
+            batch = obs
+            if single:
+                batch = obs[None] if config["obs_mode"] != "dict" else {"obstacles": obs["obstacles"][None]}
+            actions = choose_actions(batch, config["obs_mode"], config["policy"], rng, n_envs)
+            started = time.perf_counter()
+            if single:
+                obs, _, terminated, truncated, _ = env.step(int(actions[0]))
+                if terminated or truncated:
+                    episodes += 1
+                    obs, _ = env.reset()
+            else:
+                obs, _, dones, _ = env.step(actions)
+                episodes += int(dones.sum())
+            step_latencies[i] = time.perf_counter() - started
+        elapsed = time.perf_counter() - loop_started
+    finally:
+        env.close()
+        peak_rss = sampler.stop()
+
+    step_ms = step_latencies * 1000.0
+    return dict(
+        config,
+        startup_s=startup_s,
+        reset_ms_mean=float(np.mean(reset_latencies) * 1000.0) if reset_latencies else None,
+        reset_ms_p50=float(np.percentile(reset_latencies, 50) * 1000.0) if reset_latencies else None,
+        step_ms_p50=float(np.percentile(step_ms, 50)),
+        step_ms_p99=float(np.percentile(step_ms, 99)),
+        steps_per_sec=config["steps"] * n_envs / elapsed,
+        episodes=episodes,
+        peak_rss_mb=peak_rss / 2**20,
+    )
+
+
+def _run_isolated(config, queue):
+    try:
+        queue.put(run_config(config))
+    except Exception as e:
+        queue.put(dict(config, error=repr(e)))
+
+
+def run_isolated(config, timeout):
+    """Run one configuration in a fresh process so startup and peak RSS aren't shared."""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(target=_run_isolated, args=(config, queue))
+    process.start()
+    try:
+        result = queue.get(timeout=timeout)
+    except Exception:
+        process.kill()
+        result = dict(config, error=f"timed out after {timeout}s")
+    process.join()
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def browser_setups(args, backend):
+    """(browser_pool, pages_per_browser, assets) combinations to run for a backend."""
+    if backend != "browser":
+        # The sim ignores them; run it once
+        return [(False, args.pages_per_browser[0], args.assets[0])]
+    setups = []
+    for pool in args.browser_pool:
+        # Without a pool each env launches its own browser, so pages per browser don't matter
+        # (vec_env=async always shares browsers)
+        pages = args.pages_per_browser if pool or args.vec_env == "async" else args.pages_per_browser[:1]
+        for pages_per_browser in pages:
+            for assets in args.assets:
+                setups.append((bool(pool), pages_per_browser, assets))
+    return setups
+
+
+def build_configs(args):
+    configs = []
+    for backend in args.backends:
+        for obs_mode in args.obs_modes:
+            for n_envs in args.n_envs:
+                apis = ["gym", "vec"] if n_envs == 1 else ["vec"]
+                for api in apis:
+                    for browser_pool, pages_per_browser, assets in browser_setups(args, backend):
+                        configs.append({
+                            "api": api, "backend": backend, "obs_mode": obs_mode, "n_envs": n_envs,
+                            "vec_env": args.vec_env, "frame_skip": args.frame_skip,
+                            "virtual_time": args.virtual_time, "draw": not args.no_draw, "headless": True,
+                            "browser_pool": browser_pool, "pages_per_browser": pages_per_browser,
+                            "assets": assets, "max_steps": args.max_steps, "steps": args.steps,
+                            "resets": args.resets, "policy": args.policy, "seed": args.seed,
+                        })
+    return configs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Dino env throughput")
+    parser.add_argument("--backends", nargs="+", default=["sim", "browser"], choices=["sim", "browser"])
+    parser.add_argument("--obs-modes", nargs="+", default=["dict", "flat"], choices=["dict", "flat", "pixels"])
+    parser.add_argument("--n-envs", nargs="+", type=int, default=[1, 4])
+    parser.add_argument("--vec-env", default="dummy", help="VEC_ENV passed to make_dino_vec_env")
+    parser.add_argument("--steps", type=int, default=500, help="Vector steps per configuration")
+    parser.add_argument("--resets", type=int, default=5, help="Timed resets per configuration")
+    parser.add_argument("--max-steps", type=int, default=1000)
+    parser.add_argument("--frame-skip", type=int, default=4)
+    parser.add_argument("--virtual-time", action="store_true")
+    parser.add_argument("--no-draw", action="store_true", help="Skip canvas drawing in the browser game")
+    parser.add_argument("--browser-pool", nargs="+", type=int, default=[0], choices=[0, 1],
+                        help="Browser runs with (1) and/or without (0) a shared browser pool")
+    parser.add_argument("--pages-per-browser", nargs="+", type=int, default=[8],
+                        help="Pages per pooled browser")
+    parser.add_argument("--assets", nargs="+", default=["http"], choices=["http", "memory"],
+                        help="How browser pages load the game files")
+    parser.add_argument("--policy", default="scripted", choices=["scripted", "random"])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds allowed per configuration")
+    parser.add_argument("--output", default=None, help="JSON file (default: benchmarks/<timestamp>.json)")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join("benchmarks", datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    results = []
+    for config in build_configs(args):
+        result = run_isolated(config, args.timeout)
+        results.append(result)
+        label = f"{config['backend']:7} {config['obs_mode']:4} {config['api']:3} n={config['n_envs']:<4}"
+        if config["backend"] == "browser":
+            pool = f"pool/{config['pages_per_browser']}" if config["browser_pool"] else "no pool"
+            label += f" {pool:8} {config['assets']:6}"
+        if "error" in result:
+            print(f"{label} ERROR {result['error']}")
+        else:
+            print(f"{label} {result['steps_per_sec']:10.1f} steps/s | step p50 {result['step_ms_p50']:.2f} ms "
+                  f"p99 {result['step_ms_p99']:.2f} ms | reset {result['reset_ms_mean'] or 0:.2f} ms | "
+                  f"startup {result['startup_s']:.2f} s | peak RSS {result['peak_rss_mb']:.0f} MB")
+
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,83 @@
 import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
+import asyncio
+import concurrent.futures
+import itertools
 import threading
-import queue
-from game import DinoGame, start_dino_server, get_browser
+import time
+from game import DinoGame, FRAME_FIELDS, start_dino_server, create_browser, get_browser_pool
+from dino_sim import DinoSimulator
+from obstacles import obstacle_space, encode_obstacles, check_encoding
+
+# Seconds to wait for a game command unless DinoEnv(command_timeouts=...) says otherwise
+DEFAULT_COMMAND_TIMEOUT = 5.0
+
+# Attempts reset() makes, restarting the game in between, before giving up
+RESET_ATTEMPTS = 3
+
+# Normalization applied to recorded frames, matching the per-key observation scaling
+FRAME_SCALE = np.array([1.0, 1 / 1000.0, 1 / 10.0, 1 / 50.0, 1 / 100.0] + [1.0] * 12, dtype=np.float32)
+
+# Box fields concatenated, in this order, after the one-hot status in "flat" mode
+FLAT_KEYS = ("distance", "speed", "jump_velocity", "y_position", "obstacles", "history")
+
+def make_observation_space(max_obstacles=3, frame_history=0, obs_mode="dict", pixel_shape=(50, 150), frame_stack=4,
+                           obstacle_encoding="raw"):
+    """Observation space shared by DinoEnv and the vectorized Dino envs.
+
+    ``obs_mode="flat"`` gives a single float32 Box: one-hot status followed by
+    the Box fields in FLAT_KEYS order, for use with MlpPolicy. ``obs_mode="pixels"``
+    gives the last ``frame_stack`` grayscale canvas frames, channel first, for CnnPolicy.
+    """
+    if obs_mode == "pixels":
+        return spaces.Box(low=0, high=255, shape=(frame_stack,) + tuple(pixel_shape), dtype=np.uint8)
+    observation_spaces = {
+        "status": spaces.Discrete(4),
+        "distance": spaces.Box(low=0, high=1.0, shape=(1,), dtype=np.float32),         # distance/1000
+        "speed": spaces.Box(low=0.06, high=15.0, shape=(1,), dtype=np.float32),        # speed/10 
+        "jump_velocity": spaces.Box(low=-1.0, high=1.0, shape=(1,), dtype=np.float32), # velocity/50
+        "y_position": spaces.Box(low=0, high=1.0, shape=(1,), dtype=np.float32),       # y_pos/100
+        "obstacles": obstacle_space(max_obstacles, obstacle_encoding)  # see obstacles.py
+    }
+    if frame_history:
+        # Last frame_history game frames, oldest first, scaled by FRAME_SCALE
+        observation_spaces["history"] = spaces.Box(low=-100, high=1000.0, shape=(frame_history, FRAME_FIELDS),
+                                                   dtype=np.float32)
+    if obs_mode == "flat":
+        boxes = [observation_spaces[key] for key in FLAT_KEYS if key in observation_spaces]
+        low = np.concatenate([np.zeros(4, dtype=np.float32)] + [box.low.ravel() for box in boxes])
+        high = np.concatenate([np.ones(4, dtype=np.float32)] + [box.high.ravel() for box in boxes])
+        return spaces.Box(low=low, high=high, dtype=np.float32)
+    return spaces.Dict(observation_spaces)
+
+def flatten_observations(observation):
+    """Convert a batched dict observation into the (n_envs, size) "flat" layout."""
+    status = np.asarray(observation["status"])
+    parts = [np.eye(4, dtype=np.float32)[status]]
+    parts += [observation[key].reshape(len(status), -1) for key in FLAT_KEYS if key in observation]
+    return np.concatenate(parts, axis=1)
+
 
 class DinoEnv(gym.Env):
     """Custom environment for Chrome Dino game using Playwright automation."""
     metadata = {'render_modes': ['human']}
 
-    def __init__(self, verbose=False, max_steps=1000, headless=True, render_mode=None):
+    def __init__(self, verbose=False, max_steps=1000, headless=True, render_mode=None,
+                 backend="browser", frame_skip=4, virtual_time=False,
+                 browser_pool=False, pages_per_browser=8, command_timeouts=None, frame_history=0,
+                 obs_mode="dict", profile=False, assets="http", pixel_shape=(50, 150), frame_stack=4,
+                 draw=True, browser_endpoint=None, perf_interval=0.0, max_obstacles=3, obstacle_encoding="raw"):
         super().__init__()
-        start_dino_server()
+        check_encoding(obstacle_encoding)
+        if backend not in ("browser", "sim"):
+            raise ValueError(f"Unknown backend: {backend}")
+        if obs_mode not in ("dict", "flat", "pixels"):
+            raise ValueError(f"Unknown obs_mode: {obs_mode}")
+        if obs_mode == "pixels" and backend == "sim":
+            raise ValueError("obs_mode='pixels' needs the browser backend")
+        if obs_mode == "pixels" and not draw:
+            raise ValueError("obs_mode='pixels' needs draw=True")
         
         # Store render_mode for compatibility with vectorized environments
         self.render_mode = render_mode
@@ -19,23 +85,62 @@ class DinoEnv(gym.Env):
         self.verbose = verbose
         self.max_steps = max_steps
         self.headless = headless
-        
-        # Initialize async components in thread
-        self._init_game_thread()
+        self.backend = backend
+        self.frame_skip = frame_skip
+        self.virtual_time = virtual_time
+        self.frame_history = frame_history
+        self.obs_mode = obs_mode
+        self.assets = assets
+        self.pixel_shape = tuple(pixel_shape)
+        self.frame_stack = frame_stack
+        self.draw = draw  # False skips canvas drawing in the page; physics are unchanged
+        self.perf_interval = perf_interval if backend == "browser" else 0.0
+        self._history = np.zeros((frame_history, FRAME_FIELDS), dtype=np.float32)
+        # Per-phase latencies, read by timing.TimingCallback when profiling
+        self.timer = None
+        if profile:
+            from timing import PhaseTimer  # timing imports stable-baselines3 (and torch)
+            self.timer = PhaseTimer()
+
+        self.pool = None
+        self.command_timeouts = {"init": 30.0, "start_game": 10.0, "close": 10.0}
+        self.command_timeouts.update(command_timeouts or {})
+        self._request_ids = itertools.count()
+        self._pending = {}
+        self._ready = None
+        self.restarts = 0  # Game restarts after stuck or crashed pages
+
+        if backend == "sim":
+            # Native simulator runs in-process, no browser or game thread needed
+            self.sim = DinoSimulator(frame_skip=frame_skip, verbose=verbose, record_frames=frame_history > 0)
+        elif browser_pool or browser_endpoint:
+            # Page from a shared browser process, driven on the pool's event loop
+            if assets == "http":
+                start_dino_server()
+            self.pool = get_browser_pool(headless=headless, pages_per_browser=pages_per_browser,
+                                         endpoint=browser_endpoint)
+            self.game = self._make_game(pool=self.pool)
+            self._loop = self.pool.loop
+            self._ready = asyncio.run_coroutine_threadsafe(self.game.init(), self._loop)
+        else:
+            if assets == "http":
+                start_dino_server()
+            # Initialize async components in thread
+            self._init_game_thread()
         
         # Action space: 0=run, 1=jump
         self.action_space = spaces.Discrete(2)
 
         # Observation space (bounds match normalized values)
-        self.max_obstacles = 3
-        self.observation_space = spaces.Dict({
-            "status": spaces.Discrete(4),
-            "distance": spaces.Box(low=0, high=1.0, shape=(1,), dtype=np.float32),         # distance/1000
-            "speed": spaces.Box(low=0.06, high=15.0, shape=(1,), dtype=np.float32),        # speed/10 
-            "jump_velocity": spaces.Box(low=-1.0, high=1.0, shape=(1,), dtype=np.float32), # velocity/50
-            "y_position": spaces.Box(low=0, high=1.0, shape=(1,), dtype=np.float32),       # y_pos/100
-            "obstacles": spaces.Box(low=-100, high=1000.0, shape=(self.max_obstacles * 4,), dtype=np.float32)
-        })
+        self.max_obstacles = max_obstacles
+        self.obstacle_encoding = obstacle_encoding
+        self.observation_space = make_observation_space(self.max_obstacles, frame_history, obs_mode,
+                                                        self.pixel_shape, frame_stack, obstacle_encoding)
+        self._empty_obstacles = self._encode_obstacles(np.zeros((0, 4), dtype=np.float32), 0.0)
+        if obs_mode == "flat":
+            self._flat_obs = np.zeros(self.observation_space.shape, dtype=np.float32)
+        elif obs_mode == "pixels":
+            self._pixel_obs = np.zeros(self.observation_space.shape, dtype=np.uint8)
 
         # Track game state
         self.current_distance = 0.0
@@ -48,104 +153,241 @@ class DinoEnv(gym.Env):
         self.statuses = {0: "WAITING", 1: "RUNNING", 2: "JUMPING", 3: "CRASHED"}
 
     def _init_game_thread(self):
-        """Initialize game in separate thread to handle async operations."""
-        self.command_queue = queue.Queue()
-        self.result_queue = queue.Queue()
-        self.game_thread = threading.Thread(target=self._game_loop, daemon=True)
+        """Start the game's event loop in a separate thread and launch the browser on it."""
+        self._loop = asyncio.new_event_loop()
+        self.game_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
         self.game_thread.start()
-        
-    def _game_loop(self):
-        """Main game loop running in separate thread."""
-        import asyncio
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        
-        browser = get_browser(headless=self.headless)
-        game = DinoGame(browser, verbose=self.verbose)
-        
-        async def handle_commands():
-            await game.init()
-            
-            while True:
-                try:
-                    command, args = self.command_queue.get(timeout=0.01)
-                    
-                    if command == "start_game":
-                        await game.start_game()
-                        self.result_queue.put("started")
-                    elif command == "get_state":
-                        state = await game.get_game_state()
-                        self.result_queue.put(state)
-                    elif command == "action":
-                        await game.send_action(args)
-                        self.result_queue.put("action_done")
-                    elif command == "reset":
-                        await game.start_game()
-                        self.result_queue.put("reset_done")
-                    elif command == "close":
-                        await game.close()
-                        break
-                        
-                except queue.Empty:
-                    continue
-                except Exception as e:
-                    self.result_queue.put(f"error: {e}")
-                    
-        loop.run_until_complete(handle_commands())
-        
-    def _send_command(self, command, args=None):
-        """Send command to game thread and wait for result."""
-        self.command_queue.put((command, args))
+        self._ready = asyncio.run_coroutine_threadsafe(self._init_game(), self._loop)
+
+    async def _init_game(self):
+        self.playwright, self.browser = await create_browser(headless=self.headless)
+        self.game = self._make_game(self.browser)
+        await self.game.init()
+
+    def _recover(self, command, error):
+        """Restart the game in the background after a command failed; returns the incident.
+
+        The next command waits for the restart. A page is replaced first and the
+        browser relaunched if that fails. If the game thread itself is wedged,
+        a new thread and browser take over and the old ones are abandoned.
+        """
+        self.restarts += 1
+        incident = {"command": command, "error": str(error) or type(error).__name__, "restarts": self.restarts}
+        if self.verbose:
+            print(f"Game {command} failed ({error}), restarting")
+        if self.backend == "sim":
+            incident["action"] = "none"
+            return incident
+
+        if self.pool is None and not self._loop_responsive():
+            self._init_game_thread()
+            incident["action"] = "new_thread"
+        else:
+            self._ready = asyncio.run_coroutine_threadsafe(self._restart_game(), self._loop)
+            incident["action"] = "restart_page"
+        return incident
+
+    def _loop_responsive(self, timeout=1.0):
+        future = asyncio.run_coroutine_threadsafe(asyncio.sleep(0), self._loop)
+        try:
+            future.result(timeout)
+            return True
+        except Exception:
+            future.cancel()
+            return False
+
+    async def _restart_game(self):
+        """Replace the game's page and context, relaunching an unresponsive own browser."""
+        try:
+            await asyncio.wait_for(self.game.close(retire=True), 5)
+        except Exception:
+            pass
         try:
-            result = self.result_queue.get(timeout=5.0)
-            if isinstance(result, str) and result.startswith("error:"):
-                raise RuntimeError(result[6:])
-            return result
-        except queue.Empty:
-            raise RuntimeError(f"Command {command} timed out")
+            await self._replace_game()
+        except Exception:
+            if self.pool is not None:
+                raise  # The pool already drops disconnected browsers
+            await self._relaunch_browser()
+            await self._replace_game()
+
+    async def _replace_game(self):
+        game = self._make_game(None if self.pool else self.browser, pool=self.pool)
+        await game.init()
+        await game.load()
+        self.game = game
+
+    async def _relaunch_browser(self):
+        try:
+            await asyncio.wait_for(self.browser.close(), 5)
+            await asyncio.wait_for(self.playwright.stop(), 5)
+        except Exception:
+            pass
+        self.playwright, self.browser = await create_browser(headless=self.headless)
+
+    def _make_game(self, browser=None, pool=None):
+        return DinoGame(browser, verbose=self.verbose, virtual_time=self.virtual_time,
+                        frame_skip=self.frame_skip, pool=pool, record_frames=self.frame_history > 0,
+                        timer=self.timer, assets=self.assets,
+                        pixel_shape=self.pixel_shape if self.obs_mode == "pixels" else None,
+                        draw=self.draw, perf_interval=self.perf_interval)
+
+    def prewarm(self):
+        """Start loading the game page in the background; the next command waits for it.
+
+        Calling this on every env before the first reset loads all pages
+        concurrently instead of one after another.
+        """
+        if self.backend == "sim":
+            return
+        self._ready = asyncio.run_coroutine_threadsafe(self._load_game(self._ready), self._loop)
+
+    async def _load_game(self, ready=None):
+        if ready is not None:
+            await asyncio.wrap_future(ready)
+        await self.game.load()
+
+    async def _run_game_command(self, command, args=None, submitted=None):
+        """Execute one command against the DinoGame on its event loop."""
+        if self.timer and submitted is not None:
+            self.timer.stop("queue_wait", submitted)
+        game = self.game
+        if command == "start_game":
+            await game.start_game(args)
+            return "started"
+        elif command == "get_state":
+            return game.check_state(await game.get_game_state())
+        elif command == "action":
+            await game.send_action(args)
+            return "action_done"
+        elif command == "step":
+            return game.check_state(await game.step(args))
+        elif command == "reset":
+            await game.start_game()
+            return "reset_done"
+        elif command == "close":
+            await game.close()
+            if self.pool is None:
+                await self.browser.close()
+                await self.playwright.stop()
+            return "closed"
+
+    def _submit_command(self, command, args=None):
+        """Schedule a command on the game loop without waiting; returns its request id."""
+        if self._ready is not None:
+            ready, self._ready = self._ready, None
+            try:
+                ready.result(self.command_timeouts.get("init", DEFAULT_COMMAND_TIMEOUT))
+            except Exception as e:
+                ready.cancel()
+                raise RuntimeError(f"Game initialization failed: {e!r}")
+
+        request_id = next(self._request_ids)
+        submitted = time.perf_counter() if self.timer else None
+        future = asyncio.run_coroutine_threadsafe(
+            self._run_game_command(command, args, submitted), self._loop)
+        self._pending[request_id] = (command, future)
+        return request_id
+
+    def _wait_command(self, request_id, timeout=None):
+        """Wait for the result of a submitted command."""
+        command, future = self._pending.pop(request_id)
+        if timeout is None:
+            timeout = self.command_timeouts.get(command, DEFAULT_COMMAND_TIMEOUT)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # The result is tied to this future, so a late reply can't reach a later command
+            future.cancel()
+            raise RuntimeError(f"Command {command} (request {request_id}) timed out")
+        except Exception as e:
+            raise RuntimeError(str(e))
+
+    def _send_command(self, command, args=None, timeout=None):
+        """Send command to the game loop and wait for result."""
+        started = time.perf_counter()
+        if self.backend == "sim":
+            result = self._run_sim_command(command, args)
+        else:
+            result = self._wait_command(self._submit_command(command, args), timeout)
+        if self.timer:
+            self.timer.stop(f"command_{command}", started)
+        return result
+
+    def _run_sim_command(self, command, args=None):
+        """Run a command directly against the in-process simulator."""
+        if command in ("start_game", "reset"):
+            self.sim.start_game(args)
+            return "started"
+        elif command == "get_state":
+            return self.sim.get_game_state()
+        elif command == "action":
+            self.sim.send_action(args)
+            return "action_done"
+        elif command == "step":
+            return self.sim.step(args)
+        elif command == "close":
+            self.sim.close()
 
     def reset(self, seed=None, options=None):
         """Reset environment and start a new game episode."""
+        started = time.perf_counter()
         super().reset(seed=seed)
         
         self.episode_count += 1
         self.current_step = 0
         self.current_distance = 0.0
         self.previous_distance = 0.0
+        self._history[:] = 0.0
+        self._pixels_reset = True
         
-        # Start new game
-        self._send_command("start_game")
+        # Start new game, seeding the game's obstacle generator when a seed is given,
+        # restarting the page if it is stuck or crashed
+        incident = None
+        for attempt in range(RESET_ATTEMPTS):
+            try:
+                self._send_command("start_game", seed)
+                observation = self._get_observation()
+                break
+            except Exception as e:
+                if attempt == RESET_ATTEMPTS - 1:
+                    raise
+                incident = self._recover("reset", e)
         
-        # Get initial observation
-        observation = self._get_observation()
         info = self._get_info()
+        if incident:
+            info["incident"] = incident
+        if self.timer:
+            self.timer.stop("reset", started)
         
         return observation, info
 
     def step(self, action):
         """Take an action and return the new state, reward, and episode info."""
+        started = time.perf_counter()
         self.current_step += 1
         action_str = self.actions[action]
         
-        # Send action to game
+        # Send action to game and read back the new state in one round-trip
         try:
-            self._send_command("action", action_str)
-            observation = self._get_observation()
+            state = self._send_command("step", action_str)
+            normalize_started = time.perf_counter()
+            observation = self._normalize_state(state)
+            if self.timer:
+                self.timer.stop("normalize", normalize_started)
         except Exception as e:
             if self.verbose:
                 print(f"Error in step: {e}")
-            # Return proper step format with error state
+            # Not the agent's doing: truncate without a penalty while the game restarts
+            incident = self._recover("step", e)
             observation = self._get_fallback_observation()
-            reward = -100.0  # Penalty for error
-            terminated = True
-            truncated = False
-            info = {"error": str(e)}
-            return observation, reward, terminated, truncated, info
+            info = self._get_info()
+            info.update({"error": str(e), "incident": incident})
+            return observation, 0.0, False, True, info
         
         # Calculate reward and episode status
-        current_status = observation["status"]
-        self.current_distance = float(observation["distance"][0])
-        reward = self._compute_reward(observation)
+        current_status = self.observed_status
+        self.current_distance = float(self.observed_distance)
+        reward = self._compute_reward(current_status, self.observed_distance)
         terminated = self.statuses[current_status] == "CRASHED"
         truncated = self.current_step >= self.max_steps
         
@@ -160,49 +402,122 @@ class DinoEnv(gym.Env):
                     print(f"New high score: {distance}")
         
         info = self._get_info()
+        if self.timer:
+            self.timer.stop("step", started)
         return observation, reward, terminated, truncated, info
 
     def _get_observation(self):
         """Fetch and normalize the current game state as an observation."""
-        state = self._send_command("get_state")
+        return self._normalize_state(self._send_command("get_state"))
+
+    def _normalize_state(self, state):
+        """Normalize a raw game state dict into an observation."""
         if state is None:
             return self._get_fallback_observation()
         
-        return {
+        self.observed_status = state["status"]
+        self.observed_distance = np.float32(state["distance"] / 1000.0)
+        if self.frame_history:
+            frames = state.get("frames")
+            if frames is not None and len(frames):
+                frames = frames[-self.frame_history:] * FRAME_SCALE
+                self._history = np.concatenate([self._history[len(frames):], frames])
+        
+        if self.obs_mode == "pixels":
+            frame = state.get("pixels")
+            if frame is not None:
+                if self._pixels_reset:
+                    # Fill the whole stack with the first frame of the episode
+                    self._pixel_obs[:] = frame
+                    self._pixels_reset = False
+                else:
+                    self._pixel_obs[:-1] = self._pixel_obs[1:]
+                    self._pixel_obs[-1] = frame
+            return self._pixel_obs.copy()
+
+        if self.obs_mode == "flat":
+            # Write straight into the preallocated vector (layout in make_observation_space)
+            flat = self._flat_obs
+            obstacles = self._encode_obstacles(state["obstacles"], state["speed"])
+            n_obstacles = obstacles.size
+            flat[:4] = 0.0
+            flat[state["status"]] = 1.0
+            flat[4] = self.observed_distance
+            flat[5] = state["speed"] / 10.0
+            flat[6] = state["jump_velocity"] / 50.0
+            flat[7] = state["y_position"] / 100.0
+            flat[8:8 + n_obstacles] = obstacles
+            if self.frame_history:
+                flat[8 + n_obstacles:] = self._history.ravel()
+            # Vec envs keep terminal observations by reference, so hand out a copy
+            return flat.copy()
+        
+        observation = {
             "status": state["status"],
             "distance": np.array([state["distance"] / 1000.0], dtype=np.float32),
             "speed": np.array([state["speed"] / 10.0], dtype=np.float32),
             "jump_velocity": np.array([state["jump_velocity"] / 50.0], dtype=np.float32),
             "y_position": np.array([state["y_position"] / 100.0], dtype=np.float32),
-            "obstacles": np.array(state["obstacles"], dtype=np.float32)
+            "obstacles": self._encode_obstacles(state["obstacles"], state["speed"])
         }
+        if self.frame_history:
+            observation["history"] = self._history.copy()
+        return observation
     
     def _get_fallback_observation(self):
         """Return a safe fallback observation when game state is unavailable."""
-        return {
+        self.observed_status = 3
+        self.observed_distance = np.float32(0.0)
+        if self.obs_mode == "pixels":
+            return np.zeros(self.observation_space.shape, dtype=np.uint8)
+        if self.obs_mode == "flat":
+            fallback = np.zeros(self.observation_space.shape, dtype=np.float32)
+            fallback[3] = 1.0  # CRASHED
+            fallback[5] = 0.06  # Minimum speed normalized (6/10)
+            fallback[8:8 + self._empty_obstacles.size] = self._empty_obstacles
+            return fallback
+        
+        fallback = {
             "status": 3,  # CRASHED
             "distance": np.array([0.0], dtype=np.float32),
             "speed": np.array([0.06], dtype=np.float32),  # Minimum speed normalized (6/10)
             "jump_velocity": np.array([0.0], dtype=np.float32),
             "y_position": np.array([0.0], dtype=np.float32),
-            "obstacles": np.zeros(self.max_obstacles * 4, dtype=np.float32)
+            "obstacles": self._empty_obstacles.copy()
         }
+        if self.frame_history:
+            fallback["history"] = np.zeros((self.frame_history, FRAME_FIELDS), dtype=np.float32)
+        return fallback
     
+    def _encode_obstacles(self, obstacles, speed):
+        """Obstacle features of one game, from its raw (x, y, width, height) rows."""
+        return encode_obstacles(np.asarray(obstacles, dtype=np.float32).reshape(1, -1, 4), [speed],
+                                self.max_obstacles, self.obstacle_encoding)[0]
+
+    @property
+    def perf(self):
+        """Latest browser performance sample (see DinoGame.sample_perf), or None."""
+        game = getattr(self, "game", None)
+        return game.perf if self.perf_interval and game is not None else None
+
     def _get_info(self):
         """Get auxiliary info for debugging."""
-        return {
+        info = {
             "distance": self.current_distance,
             "best_distance": self.best_distance,
             "step": self.current_step
         }
+        if self.perf_interval:
+            info["perf"] = self.perf
+        return info
 
-    def _compute_reward(self, observation):
+    def _compute_reward(self, status_code, distance):
         """Simple reward: make progress, don't crash. Let the agent learn everything else."""
-        status = self.statuses[observation["status"]]
+        status = self.statuses[status_code]
         
         # Progress is the main reward - more distance = better
-        progress = observation["distance"][0] - getattr(self, "previous_distance", 0.0)
-        self.previous_distance = observation["distance"][0]
+        progress = distance - getattr(self, "previous_distance", 0.0)
+        self.previous_distance = distance
         
         if self.verbose and progress > 0:
             print(f"Progress this step: {progress}")
@@ -216,12 +531,19 @@ class DinoEnv(gym.Env):
         else:
             return progress_reward
     
+    def reset_timings(self):
+        """Clear recorded phase latencies (called by TimingCallback after logging)."""
+        if self.timer:
+            self.timer.reset()
+
     def close(self):
         """Clean up resources."""
         try:
             self._send_command("close")
         except:
             pass  # Ignore errors on close
+        if self.backend != "sim" and self.pool is None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
 
 
 # Register the environment with Gymnasium
@@ -233,6 +555,23 @@ gym.register(
         'verbose': False,
         'max_steps': 1000,
         'headless': True,
-        'render_mode': None
+        'render_mode': None,
+        'backend': 'browser',
+        'frame_skip': 4,
+        'virtual_time': False,
+        'browser_pool': False,
+        'pages_per_browser': 8,
+        'command_timeouts': None,
+        'frame_history': 0,
+        'obs_mode': 'dict',
+        'profile': False,
+        'assets': 'http',
+        'pixel_shape': (50, 150),
+        'frame_stack': 4,
+        'draw': True,
+        'browser_endpoint': None,
+        'perf_interval': 0.0,
+        'max_obstacles': 3,
+        'obstacle_encoding': 'raw'
     }
 )
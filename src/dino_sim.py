@@ -0,0 +1,562 @@
+import math
+import random
+
+import numpy as np
+
+# Game constants mirrored from t-rex-runner's index.js (Runner, Trex, Horizon, Obstacle)
+FPS = 60
+MS_PER_FRAME = 1000 / FPS
+WIDTH = 600
+HEIGHT = 150
+BOTTOM_PAD = 10
+
+SPEED = 6
+MAX_SPEED = 13
+ACCELERATION = 0.001
+CLEAR_TIME = 3000
+GAP_COEFFICIENT = 0.6
+MAX_GAP_COEFFICIENT = 1.5
+MAX_OBSTACLE_LENGTH = 3
+MAX_OBSTACLE_DUPLICATION = 2
+DISTANCE_COEFFICIENT = 0.025
+
+TREX_X = 50
+TREX_WIDTH = 44
+TREX_HEIGHT = 47
+TREX_GRAVITY = 0.6
+TREX_INITIAL_JUMP_VELOCITY = -10
+TREX_DROP_VELOCITY = -5
+TREX_MIN_JUMP_HEIGHT = 30
+TREX_MAX_JUMP_HEIGHT = 30
+GROUND_Y = HEIGHT - TREX_HEIGHT - BOTTOM_PAD
+MIN_JUMP_Y = GROUND_Y - TREX_MIN_JUMP_HEIGHT
+
+# DinoGame.send_action holds ArrowUp for 80 ms before releasing it
+JUMP_HOLD_FRAMES = round(0.08 * FPS)
+
+# (x, y, width, height) boxes relative to the t-rex sprite
+TREX_COLLISION_BOXES = (
+    (22, 0, 17, 16),
+    (1, 18, 30, 9),
+    (10, 35, 14, 8),
+    (1, 24, 29, 5),
+    (5, 30, 21, 4),
+    (9, 34, 15, 4),
+)
+
+OBSTACLE_TYPES = (
+    {
+        "type": "CACTUS_SMALL", "width": 17, "height": 35, "y_pos": (105,),
+        "multiple_speed": 4, "min_gap": 120, "min_speed": 0, "speed_offset": 0,
+        "collision_boxes": ((0, 7, 5, 27), (4, 0, 6, 34), (10, 4, 7, 14)),
+    },
+    {
+        "type": "CACTUS_LARGE", "width": 25, "height": 50, "y_pos": (90,),
+        "multiple_speed": 7, "min_gap": 120, "min_speed": 0, "speed_offset": 0,
+        "collision_boxes": ((0, 12, 7, 38), (8, 0, 7, 49), (13, 10, 10, 38)),
+    },
+    {
+        "type": "PTERODACTYL", "width": 46, "height": 40, "y_pos": (100, 75, 50),
+        "multiple_speed": 999, "min_gap": 150, "min_speed": 8.5, "speed_offset": 0.8,
+        "collision_boxes": ((15, 15, 16, 5), (18, 21, 24, 6), (2, 14, 4, 3), (6, 10, 4, 7), (10, 8, 6, 9)),
+    },
+)
+
+STATUS_MAP = {'WAITING': 0, 'RUNNING': 1, 'JUMPING': 2, 'CRASHED': 3}
+
+
+def js_round(value):
+    """Math.round semantics (halves round up), unlike Python's banker's rounding."""
+    return math.floor(value + 0.5)
+
+
+def box_compare(a, b):
+    """Axis-aligned overlap test between two (x, y, width, height) boxes."""
+    return (a[0] < b[0] + b[2] and a[0] + a[2] > b[0] and
+            a[1] < b[1] + b[3] and a[1] + a[3] > b[1])
+
+
+class Obstacle:
+    """A single cactus or pterodactyl moving along the horizon."""
+
+    def __init__(self, type_index, speed, rng):
+        config = OBSTACLE_TYPES[type_index]
+        self.type_index = type_index
+        self.config = config
+        self.size = rng.randint(1, MAX_OBSTACLE_LENGTH)
+        if self.size > 1 and config["multiple_speed"] > speed:
+            self.size = 1
+        self.width = config["width"] * self.size
+        self.height = config["height"]
+        self.x = WIDTH + config["width"]
+        self.y = config["y_pos"][rng.randint(0, len(config["y_pos"]) - 1)]
+        self.following_created = False
+
+        # Central box is stretched to cover the extra width of grouped cacti
+        boxes = [list(box) for box in config["collision_boxes"]]
+        if self.size > 1:
+            boxes[1][2] = self.width - boxes[0][2] - boxes[2][2]
+            boxes[2][0] = self.width - boxes[2][2]
+        self.collision_boxes = boxes
+
+        self.speed_offset = 0
+        if config["speed_offset"]:
+            self.speed_offset = config["speed_offset"] if rng.random() > 0.5 else -config["speed_offset"]
+
+        min_gap = js_round(self.width * speed + config["min_gap"] * GAP_COEFFICIENT)
+        max_gap = js_round(min_gap * MAX_GAP_COEFFICIENT)
+        self.gap = rng.randint(min_gap, max_gap)
+
+    def update(self, delta_time, speed):
+        self.x -= math.floor(((speed + self.speed_offset) * FPS / 1000) * delta_time)
+
+    def is_visible(self):
+        return self.x + self.width > 0
+
+
+class DinoSimulator:
+    """Headless re-implementation of the t-rex-runner game loop.
+
+    Exposes the same ``start_game``/``send_action``/``get_game_state`` surface as
+    ``DinoGame`` but runs synchronously, advancing ``frame_skip`` game frames per action.
+    """
+
+    STATUS_MAP = STATUS_MAP
+
+    def __init__(self, frame_skip=4, seed=None, verbose=False, record_frames=False):
+        self.frame_skip = frame_skip
+        self.verbose = verbose
+        self.record_frames = record_frames
+        self.rng = random.Random(seed)
+        self._frames = []
+        self._reset_state()
+
+    def seed(self, seed=None):
+        """Reseed the obstacle generator."""
+        self.rng.seed(seed)
+
+    def _reset_state(self):
+        self.status = 'WAITING'
+        self.crashed = False
+        self.speed = SPEED
+        self.distance_ran = 0.0
+        self.running_time = 0.0
+        self.y_pos = GROUND_Y
+        self.jump_velocity = 0.0
+        self.jumping = False
+        self.reached_min_height = False
+        self.jump_hold = 0
+        self.obstacles = []
+        self.obstacle_history = []
+
+    def start_game(self, seed=None):
+        """Start or restart the game, equivalent to Runner.restart() after the intro."""
+        if seed is not None:
+            self.seed(seed)
+        self._reset_state()
+        self._frames = []
+        self.status = 'RUNNING'
+
+    def send_action(self, action):
+        """Apply an action and advance the game by ``frame_skip`` frames."""
+        if action == "jump" and not self.crashed and not self.jumping:
+            self._start_jump()
+        for _ in range(self.frame_skip):
+            if self.crashed:
+                break
+            self._update(MS_PER_FRAME)
+            if self.record_frames:
+                state = self._state()
+                frame = np.zeros(17, dtype=np.float32)
+                frame[:5] = [state["status"], state["distance"], state["speed"],
+                             state["jump_velocity"], state["y_position"]]
+                # The recorder layout holds the first 3 obstacles
+                obstacles = state["obstacles"][:3].ravel()
+                frame[5:5 + obstacles.size] = obstacles
+                self._frames.append(frame)
+
+    def step(self, action):
+        """Apply an action and return the resulting state, like ``DinoGame.step``."""
+        self.send_action(action)
+        return self.get_game_state()
+
+    def get_game_state(self):
+        """Return the current state in the format of ``DinoGame.get_game_state``."""
+        state = self._state()
+        if self.record_frames:
+            # Same (frames, 17) layout as DinoGame's in-page recorder
+            state["frames"] = np.array(self._frames, dtype=np.float32).reshape(-1, 17)
+            self._frames = []
+        return state
+
+    def _state(self):
+        obstacles = np.array([(o.x, o.y, o.width, o.height) for o in self.obstacles],
+                             dtype=np.float32).reshape(-1, 4)
+
+        return {
+            "status": self.STATUS_MAP[self.status],
+            "distance": float(js_round(self.distance_ran * DISTANCE_COEFFICIENT)),
+            "speed": float(self.speed),
+            "jump_velocity": float(self.jump_velocity),
+            "y_position": float(self.y_pos),
+            "obstacles": obstacles
+        }
+
+    def close(self):
+        """No resources to release; kept for parity with DinoGame."""
+
+    # Trex ----------------------------------------------------------------
+
+    def _start_jump(self):
+        self.status = 'JUMPING'
+        self.jump_velocity = TREX_INITIAL_JUMP_VELOCITY - self.speed / 10
+        self.jumping = True
+        self.reached_min_height = False
+        self.jump_hold = JUMP_HOLD_FRAMES
+
+    def _end_jump(self):
+        if self.reached_min_height and self.jump_velocity < TREX_DROP_VELOCITY:
+            self.jump_velocity = TREX_DROP_VELOCITY
+
+    def _update_jump(self, delta_time):
+        frames_elapsed = delta_time / MS_PER_FRAME
+        self.y_pos += js_round(self.jump_velocity * frames_elapsed)
+        self.jump_velocity += TREX_GRAVITY * frames_elapsed
+
+        if self.y_pos < MIN_JUMP_Y:
+            self.reached_min_height = True
+        if self.y_pos < TREX_MAX_JUMP_HEIGHT:
+            self._end_jump()
+        if self.y_pos > GROUND_Y:
+            self.y_pos = GROUND_Y
+            self.jump_velocity = 0.0
+            self.jumping = False
+            self.status = 'RUNNING'
+
+    # Horizon -------------------------------------------------------------
+
+    def _duplicate_obstacle_check(self, type_index):
+        duplicate_count = 0
+        for previous in self.obstacle_history:
+            duplicate_count = duplicate_count + 1 if previous == type_index else 0
+        return duplicate_count >= MAX_OBSTACLE_DUPLICATION
+
+    def _add_new_obstacle(self):
+        while True:
+            type_index = self.rng.randint(0, len(OBSTACLE_TYPES) - 1)
+            if (not self._duplicate_obstacle_check(type_index) and
+                    self.speed >= OBSTACLE_TYPES[type_index]["min_speed"]):
+                break
+        self.obstacles.append(Obstacle(type_index, self.speed, self.rng))
+        self.obstacle_history.insert(0, type_index)
+        del self.obstacle_history[MAX_OBSTACLE_DUPLICATION:]
+
+    def _update_obstacles(self, delta_time):
+        for obstacle in self.obstacles:
+            obstacle.update(delta_time, self.speed)
+        self.obstacles = [o for o in self.obstacles if o.is_visible()]
+
+        if self.obstacles:
+            last = self.obstacles[-1]
+            if (not last.following_created and last.is_visible() and
+                    last.x + last.width + last.gap < WIDTH):
+                self._add_new_obstacle()
+                last.following_created = True
+        else:
+            self._add_new_obstacle()
+
+    def _check_collision(self, obstacle):
+        trex_box = (TREX_X + 1, self.y_pos + 1, TREX_WIDTH - 2, TREX_HEIGHT - 2)
+        obstacle_box = (obstacle.x + 1, obstacle.y + 1, obstacle.width - 2, obstacle.height - 2)
+        if not box_compare(trex_box, obstacle_box):
+            return False
+
+        for tx, ty, tw, th in TREX_COLLISION_BOXES:
+            adj_trex = (tx + trex_box[0], ty + trex_box[1], tw, th)
+            for ox, oy, ow, oh in obstacle.collision_boxes:
+                if box_compare(adj_trex, (ox + obstacle_box[0], oy + obstacle_box[1], ow, oh)):
+                    return True
+        return False
+
+    # Runner --------------------------------------------------------------
+
+    def _update(self, delta_time):
+        """One Runner.update() frame."""
+        if self.jumping:
+            self._update_jump(delta_time)
+            if self.jump_hold > 0:
+                self.jump_hold -= 1
+                if self.jump_hold == 0:
+                    self._end_jump()
+
+        self.running_time += delta_time
+        has_obstacles = self.running_time > CLEAR_TIME
+        if has_obstacles:
+            self._update_obstacles(delta_time)
+
+        if has_obstacles and self.obstacles and self._check_collision(self.obstacles[0]):
+            self.crashed = True
+            self.status = 'CRASHED'
+            if self.verbose:
+                print(f"Crashed at distance {js_round(self.distance_ran * DISTANCE_COEFFICIENT)}")
+            return
+
+        self.distance_ran += self.speed * delta_time / MS_PER_FRAME
+        if self.speed < MAX_SPEED:
+            self.speed += ACCELERATION
+
+
+# Struct-of-arrays lookup tables for BatchDinoSimulator
+MAX_OBSTACLE_SLOTS = 8
+_TYPE_WIDTH = np.array([t["width"] for t in OBSTACLE_TYPES], dtype=np.float64)
+_TYPE_HEIGHT = np.array([t["height"] for t in OBSTACLE_TYPES], dtype=np.float64)
+_TYPE_MULTIPLE_SPEED = np.array([t["multiple_speed"] for t in OBSTACLE_TYPES], dtype=np.float64)
+_TYPE_MIN_GAP = np.array([t["min_gap"] for t in OBSTACLE_TYPES], dtype=np.float64)
+_TYPE_MIN_SPEED = np.array([t["min_speed"] for t in OBSTACLE_TYPES], dtype=np.float64)
+_TYPE_SPEED_OFFSET = np.array([t["speed_offset"] for t in OBSTACLE_TYPES], dtype=np.float64)
+_TYPE_N_Y = np.array([len(t["y_pos"]) for t in OBSTACLE_TYPES])
+_TYPE_Y = np.array([list(t["y_pos"]) + [0] * (3 - len(t["y_pos"])) for t in OBSTACLE_TYPES], dtype=np.float64)
+_TYPE_BOXES = np.zeros((len(OBSTACLE_TYPES), 5, 4), dtype=np.float64)
+_TYPE_BOX_VALID = np.zeros((len(OBSTACLE_TYPES), 5), dtype=bool)
+for _i, _t in enumerate(OBSTACLE_TYPES):
+    _TYPE_BOXES[_i, :len(_t["collision_boxes"])] = _t["collision_boxes"]
+    _TYPE_BOX_VALID[_i, :len(_t["collision_boxes"])] = True
+_TREX_BOXES = np.array(TREX_COLLISION_BOXES, dtype=np.float64)
+
+
+def _np_js_round(value):
+    return np.floor(value + 0.5)
+
+
+def _np_box_compare(ax, ay, aw, ah, bx, by, bw, bh):
+    return (ax < bx + bw) & (ax + aw > bx) & (ay < by + bh) & (ay + ah > by)
+
+
+class BatchDinoSimulator:
+    """N independent Dino games stepped together as struct-of-arrays NumPy state.
+
+    Follows the same rules as ``DinoSimulator``; every per-frame update is a
+    vectorized operation over all games, so the only Python loop is over frames.
+    """
+
+    _OBSTACLE_FIELDS = ("ob_x", "ob_y", "ob_w", "ob_h", "ob_type", "ob_size",
+                        "ob_offset", "ob_gap", "ob_following")
+
+    def __init__(self, n_games, frame_skip=4, seed=None):
+        self.n_games = n_games
+        self.frame_skip = frame_skip
+        self.rng = np.random.default_rng(seed)
+
+        n, k = n_games, MAX_OBSTACLE_SLOTS
+        self.crashed = np.zeros(n, dtype=bool)
+        self.speed = np.zeros(n, dtype=np.float64)
+        self.distance_ran = np.zeros(n, dtype=np.float64)
+        self.running_time = np.zeros(n, dtype=np.float64)
+        self.y_pos = np.zeros(n, dtype=np.float64)
+        self.jump_velocity = np.zeros(n, dtype=np.float64)
+        self.jumping = np.zeros(n, dtype=bool)
+        self.reached_min_height = np.zeros(n, dtype=bool)
+        self.jump_hold = np.zeros(n, dtype=np.int64)
+        self.history = np.full((n, MAX_OBSTACLE_DUPLICATION), -1, dtype=np.int64)
+
+        self.ob_count = np.zeros(n, dtype=np.int64)
+        self.ob_x = np.zeros((n, k), dtype=np.float64)
+        self.ob_y = np.zeros((n, k), dtype=np.float64)
+        self.ob_w = np.zeros((n, k), dtype=np.float64)
+        self.ob_h = np.zeros((n, k), dtype=np.float64)
+        self.ob_type = np.zeros((n, k), dtype=np.int64)
+        self.ob_size = np.zeros((n, k), dtype=np.int64)
+        self.ob_offset = np.zeros((n, k), dtype=np.float64)
+        self.ob_gap = np.zeros((n, k), dtype=np.float64)
+        self.ob_following = np.zeros((n, k), dtype=bool)
+        self._slots = np.arange(k)
+        self._rows = np.arange(n)
+
+        self.start_games()
+
+    def seed(self, seed=None):
+        """Reseed the obstacle generator shared by all games."""
+        self.rng = np.random.default_rng(seed)
+
+    def start_games(self, mask=None):
+        """Restart the games selected by ``mask`` (all games if None)."""
+        if mask is None:
+            mask = slice(None)
+        self.crashed[mask] = False
+        self.speed[mask] = SPEED
+        self.distance_ran[mask] = 0.0
+        self.running_time[mask] = 0.0
+        self.y_pos[mask] = GROUND_Y
+        self.jump_velocity[mask] = 0.0
+        self.jumping[mask] = False
+        self.reached_min_height[mask] = False
+        self.jump_hold[mask] = 0
+        self.history[mask] = -1
+        self.ob_count[mask] = 0
+        for name in self._OBSTACLE_FIELDS:
+            getattr(self, name)[mask] = 0
+
+    def step(self, jump):
+        """Apply a boolean jump mask and advance every game by ``frame_skip`` frames."""
+        start = np.asarray(jump, dtype=bool) & ~self.crashed & ~self.jumping
+        if start.any():
+            self.jump_velocity[start] = TREX_INITIAL_JUMP_VELOCITY - self.speed[start] / 10
+            self.jumping[start] = True
+            self.reached_min_height[start] = False
+            self.jump_hold[start] = JUMP_HOLD_FRAMES
+        for _ in range(self.frame_skip):
+            self._update(MS_PER_FRAME)
+
+    @property
+    def status(self):
+        """Per-game status codes following ``STATUS_MAP``."""
+        return np.where(self.crashed, STATUS_MAP['CRASHED'],
+                        np.where(self.jumping, STATUS_MAP['JUMPING'], STATUS_MAP['RUNNING']))
+
+    @property
+    def distance(self):
+        """Distance as shown by the distance meter."""
+        return _np_js_round(self.distance_ran * DISTANCE_COEFFICIENT)
+
+    def obstacle_boxes(self):
+        """(n_games, MAX_OBSTACLE_SLOTS, 4) obstacle (x, y, width, height) rows, empty slots zeroed."""
+        boxes = np.stack([self.ob_x, self.ob_y, self.ob_w, self.ob_h], axis=2).astype(np.float32)
+        boxes[self._slots >= self.ob_count[:, None]] = 0
+        return boxes
+
+    def _end_jump(self, mask):
+        drop = mask & self.reached_min_height & (self.jump_velocity < TREX_DROP_VELOCITY)
+        self.jump_velocity[drop] = TREX_DROP_VELOCITY
+
+    def _update_jumps(self, active, delta_time):
+        m = active & self.jumping
+        if not m.any():
+            return
+        frames_elapsed = delta_time / MS_PER_FRAME
+        self.y_pos[m] += _np_js_round(self.jump_velocity[m] * frames_elapsed)
+        self.jump_velocity[m] += TREX_GRAVITY * frames_elapsed
+
+        self.reached_min_height |= m & (self.y_pos < MIN_JUMP_Y)
+        self._end_jump(m & (self.y_pos < TREX_MAX_JUMP_HEIGHT))
+        landed = m & (self.y_pos > GROUND_Y)
+        self.y_pos[landed] = GROUND_Y
+        self.jump_velocity[landed] = 0.0
+        self.jumping[landed] = False
+
+        held = m & (self.jump_hold > 0)
+        self.jump_hold[held] -= 1
+        self._end_jump(held & (self.jump_hold == 0))
+
+    def _spawn_obstacles(self, rows):
+        """Append one new obstacle to each game in ``rows``."""
+        speed = self.speed[rows]
+        types = self.rng.integers(0, len(OBSTACLE_TYPES), size=rows.size)
+        while True:
+            invalid = ((self.history[rows, 0] == types) & (self.history[rows, 1] == types)) | \
+                (speed < _TYPE_MIN_SPEED[types])
+            if not invalid.any():
+                break
+            types[invalid] = self.rng.integers(0, len(OBSTACLE_TYPES), size=int(invalid.sum()))
+
+        size = self.rng.integers(1, MAX_OBSTACLE_LENGTH + 1, size=rows.size)
+        size[(size > 1) & (_TYPE_MULTIPLE_SPEED[types] > speed)] = 1
+        width = _TYPE_WIDTH[types] * size
+        y = _TYPE_Y[types, (self.rng.random(rows.size) * _TYPE_N_Y[types]).astype(np.int64)]
+        offset = np.where(self.rng.random(rows.size) > 0.5, 1.0, -1.0) * _TYPE_SPEED_OFFSET[types]
+        min_gap = _np_js_round(width * speed + _TYPE_MIN_GAP[types] * GAP_COEFFICIENT)
+        max_gap = _np_js_round(min_gap * MAX_GAP_COEFFICIENT)
+        gap = np.floor(self.rng.random(rows.size) * (max_gap - min_gap + 1)) + min_gap
+
+        slot = self.ob_count[rows]
+        self.ob_x[rows, slot] = WIDTH + _TYPE_WIDTH[types]
+        self.ob_y[rows, slot] = y
+        self.ob_w[rows, slot] = width
+        self.ob_h[rows, slot] = _TYPE_HEIGHT[types]
+        self.ob_type[rows, slot] = types
+        self.ob_size[rows, slot] = size
+        self.ob_offset[rows, slot] = offset
+        self.ob_gap[rows, slot] = gap
+        self.ob_following[rows, slot] = False
+        self.ob_count[rows] += 1
+
+        self.history[rows, 1] = self.history[rows, 0]
+        self.history[rows, 0] = types
+
+    def _update_obstacles(self, active, delta_time):
+        occupied = self._slots < self.ob_count[:, None]
+        moving = occupied & active[:, None]
+        step = np.floor(((self.speed[:, None] + self.ob_offset) * FPS / 1000) * delta_time)
+        self.ob_x -= np.where(moving, step, 0)
+
+        # Drop obstacles that left the screen, keeping the rest left-aligned
+        removed = moving & (self.ob_x + self.ob_w <= 0)
+        rows = np.nonzero(removed.any(axis=1))[0]
+        if rows.size:
+            keep = occupied[rows] & ~removed[rows]
+            order = np.argsort(~keep, axis=1, kind='stable')
+            for name in self._OBSTACLE_FIELDS:
+                field = getattr(self, name)
+                field[rows] = np.take_along_axis(field[rows], order, axis=1)
+            self.ob_count[rows] = keep.sum(axis=1)
+
+        last = np.maximum(self.ob_count - 1, 0)
+        last_x = self.ob_x[self._rows, last]
+        last_w = self.ob_w[self._rows, last]
+        needs_following = (self.ob_count > 0) & ~self.ob_following[self._rows, last] & \
+            (last_x + last_w > 0) & (last_x + last_w + self.ob_gap[self._rows, last] < WIDTH) & \
+            (self.ob_count < MAX_OBSTACLE_SLOTS)
+        spawn = active & ((self.ob_count == 0) | needs_following)
+        self.ob_following[self._rows[active & needs_following], last[active & needs_following]] = True
+        rows = np.nonzero(spawn)[0]
+        if rows.size:
+            self._spawn_obstacles(rows)
+
+    def _check_collisions(self, candidates):
+        """Collision test between each t-rex and its leading obstacle."""
+        rows = np.nonzero(candidates)[0]
+        hits = np.zeros(self.n_games, dtype=bool)
+        if not rows.size:
+            return hits
+
+        trex_x, trex_y = TREX_X + 1, self.y_pos[rows] + 1
+        ob_x = self.ob_x[rows, 0] + 1
+        ob_y = self.ob_y[rows, 0] + 1
+        ob_w = self.ob_w[rows, 0]
+        outer = _np_box_compare(trex_x, trex_y, TREX_WIDTH - 2, TREX_HEIGHT - 2,
+                                ob_x, ob_y, ob_w - 2, self.ob_h[rows, 0] - 2)
+        if not outer.any():
+            return hits
+        rows, trex_y, ob_x, ob_y, ob_w = rows[outer], trex_y[outer], ob_x[outer], ob_y[outer], ob_w[outer]
+
+        types = self.ob_type[rows, 0]
+        boxes = _TYPE_BOXES[types].copy()
+        multiple = self.ob_size[rows, 0] > 1
+        boxes[multiple, 1, 2] = ob_w[multiple] - boxes[multiple, 0, 2] - boxes[multiple, 2, 2]
+        boxes[multiple, 2, 0] = ob_w[multiple] - boxes[multiple, 2, 2]
+
+        # (games, trex boxes, obstacle boxes) pairwise overlap
+        tx = _TREX_BOXES[None, :, 0, None] + trex_x
+        ty = _TREX_BOXES[None, :, 1, None] + trex_y[:, None, None]
+        ox = boxes[:, None, :, 0] + ob_x[:, None, None]
+        oy = boxes[:, None, :, 1] + ob_y[:, None, None]
+        overlap = _np_box_compare(tx, ty, _TREX_BOXES[None, :, 2, None], _TREX_BOXES[None, :, 3, None],
+                                  ox, oy, boxes[:, None, :, 2], boxes[:, None, :, 3])
+        overlap &= _TYPE_BOX_VALID[types][:, None, :]
+        hits[rows] = overlap.any(axis=(1, 2))
+        return hits
+
+    def _update(self, delta_time):
+        """One Runner.update() frame for every game that has not crashed."""
+        active = ~self.crashed
+        self._update_jumps(active, delta_time)
+
+        self.running_time[active] += delta_time
+        has_obstacles = active & (self.running_time > CLEAR_TIME)
+        self._update_obstacles(has_obstacles, delta_time)
+
+        crashed = self._check_collisions(has_obstacles & (self.ob_count > 0))
+        self.crashed |= crashed
+        running = active & ~crashed
+        self.distance_ran[running] += self.speed[running] * delta_time / MS_PER_FRAME
+        accelerating = running & (self.speed < MAX_SPEED)
+        self.speed[accelerating] += ACCELERATION
@@ -0,0 +1,701 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+import gymnasium as gym
+from gymnasium import spaces
+from stable_baselines3.common.env_util import make_vec_env, is_wrapped
+from stable_baselines3.common.vec_env import VecEnv
+from dino_env import make_observation_space, flatten_observations, DEFAULT_COMMAND_TIMEOUT, RESET_ATTEMPTS
+from dino_sim import BatchDinoSimulator
+from obstacles import encode_obstacles, stack_obstacles, check_encoding
+from game import DinoGame, BrowserPool, start_dino_server
+from timing import PhaseTimer
+from trajectory import TrajectoryRecorder
+
+# Raw state used when a page fails to report one, matching DinoEnv._get_fallback_observation
+FALLBACK_STATE = {
+    "status": 3,
+    "distance": 0.0,
+    "speed": 0.6,
+    "jump_velocity": 0.0,
+    "y_position": 0.0,
+    "obstacles": np.zeros((0, 4), dtype=np.float32)
+}
+
+
+class DinoBaseVecEnv(VecEnv):
+    """Shared reward, termination and auto-reset bookkeeping for the Dino VecEnvs."""
+
+    perf = None  # Browser performance samples, for envs that take them
+
+    def __init__(self, n_envs, verbose=False, max_steps=1000, obs_mode="dict", profile=False, max_obstacles=3,
+                 obstacle_encoding="raw"):
+        self.render_mode = None
+        self.verbose = verbose
+        self.max_steps = max_steps
+        self.max_obstacles = max_obstacles
+        if obs_mode not in ("dict", "flat"):
+            raise ValueError(f"{type(self).__name__} does not support obs_mode={obs_mode!r}")
+        check_encoding(obstacle_encoding)
+        self.obs_mode = obs_mode
+        self.obstacle_encoding = obstacle_encoding
+        self.timer = PhaseTimer() if profile else None
+        observation_space = make_observation_space(self.max_obstacles, obs_mode=obs_mode,
+                                                   obstacle_encoding=obstacle_encoding)
+        super().__init__(n_envs, observation_space, spaces.Discrete(2))
+
+        self.actions = np.zeros(n_envs, dtype=np.int64)
+        self.current_step = np.zeros(n_envs, dtype=np.int64)
+        self.previous_distance = np.zeros(n_envs, dtype=np.float32)
+        self.best_distance = np.zeros(n_envs, dtype=np.float64)
+
+    def _reset_counters(self, mask=slice(None)):
+        self.current_step[mask] = 0
+        self.previous_distance[mask] = 0.0
+
+    def _normalize_states(self, states):
+        """Stack raw game state dicts into a normalized batched observation."""
+        states = [FALLBACK_STATE if state is None else state for state in states]
+        speed = np.array([state["speed"] for state in states], dtype=np.float32)
+        obstacles = stack_obstacles([state["obstacles"] for state in states])
+        return {
+            "status": np.array([state["status"] for state in states], dtype=np.int64),
+            "distance": np.array([[state["distance"] / 1000.0] for state in states], dtype=np.float32),
+            "speed": (speed / 10.0)[:, None],
+            "jump_velocity": np.array([[state["jump_velocity"] / 50.0] for state in states], dtype=np.float32),
+            "y_position": np.array([[state["y_position"] / 100.0] for state in states], dtype=np.float32),
+            "obstacles": encode_obstacles(obstacles, speed, self.max_obstacles, self.obstacle_encoding)
+        }
+
+    def _format_observation(self, observation):
+        """Return the batched dict observation in the configured obs_mode."""
+        if self.obs_mode == "flat":
+            return flatten_observations(observation)
+        return observation
+
+    def _finish_step(self, observation, terminated, truncated, reset_observation=None):
+        """Compute rewards and infos, then swap in reset observations for finished envs."""
+        distance = observation["distance"][:, 0]
+        rewards = np.where(terminated, -50.0, (distance - self.previous_distance) * 100.0).astype(np.float32)
+        self.previous_distance = distance.copy()
+        observation = self._format_observation(observation)
+
+        dones = terminated | truncated
+        infos = [{} for _ in range(self.num_envs)]
+        done_idx = np.nonzero(dones)[0]
+        if done_idx.size:
+            crashed_distance = np.round(distance * 1000)
+            self.best_distance[terminated] = np.maximum(self.best_distance[terminated], crashed_distance[terminated])
+            for i in done_idx:
+                infos[i] = {
+                    "distance": float(distance[i]),
+                    "best_distance": float(self.best_distance[i]),
+                    "step": int(self.current_step[i]),
+                    "terminal_observation": self._terminal_observation(observation, i),
+                    "TimeLimit.truncated": bool(truncated[i] and not terminated[i]),
+                }
+                if self.verbose and terminated[i]:
+                    print(f"Env {i} crashed at distance {int(crashed_distance[i])}")
+
+            # Auto-reset finished games, as SB3 expects from a VecEnv
+            self._reset_counters(dones)
+            reset_observation = self._format_observation(reset_observation)
+            if self.obs_mode == "flat":
+                observation[dones] = reset_observation[dones]
+            else:
+                for key, value in observation.items():
+                    value[dones] = reset_observation[key][dones]
+
+        return observation, rewards, dones, infos
+
+    def prewarm(self):
+        """Load game pages ahead of the first reset; nothing to do without a browser."""
+
+    def _time(self, phase, started):
+        if self.timer:
+            self.timer.stop(phase, started)
+
+    def reset_timings(self):
+        if self.timer:
+            self.timer.reset()
+
+    def _terminal_observation(self, observation, i):
+        if self.obs_mode == "flat":
+            return observation[i].copy()
+        return {key: value[i].copy() for key, value in observation.items()}
+
+    def step_async(self, actions):
+        self.actions = np.asarray(actions).reshape(self.num_envs)
+
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self, attr_name) for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        method = getattr(self, method_name)
+        return [method(*method_args, **method_kwargs) for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
+
+
+class DinoSimVecEnv(DinoBaseVecEnv):
+    """Vectorized Dino environment stepping N simulated games in one NumPy call.
+
+    Observations and rewards match DinoEnv(backend='sim'), but state lives in a
+    BatchDinoSimulator so the cost of a step grows sublinearly with ``n_envs``.
+    """
+
+    def __init__(self, n_envs, verbose=False, max_steps=1000, frame_skip=4, seed=None, obs_mode="dict",
+                 profile=False, max_obstacles=3, obstacle_encoding="raw"):
+        self.sim = BatchDinoSimulator(n_envs, frame_skip=frame_skip, seed=seed)
+        super().__init__(n_envs, verbose=verbose, max_steps=max_steps, obs_mode=obs_mode, profile=profile,
+                         max_obstacles=max_obstacles, obstacle_encoding=obstacle_encoding)
+
+    def reset(self):
+        """Restart every game and return the batched initial observation."""
+        if self._seeds[0] is not None:
+            self.sim.seed(self._seeds[0])
+        self._reset_seeds()
+        self._reset_options()
+
+        self.sim.start_games()
+        self._reset_counters()
+        return self._format_observation(self._get_observation())
+
+    def step_wait(self):
+        started = time.perf_counter()
+        self.current_step += 1
+        self.sim.step(self.actions == 1)
+        self._time("sim_step", started)
+
+        started = time.perf_counter()
+        observation = self._get_observation()
+        terminated = self.sim.crashed.copy()
+        truncated = self.current_step >= self.max_steps
+        dones = terminated | truncated
+        reset_observation = None
+        if dones.any():
+            self.sim.start_games(dones)
+            reset_observation = self._get_observation()
+        result = self._finish_step(observation, terminated, truncated, reset_observation)
+        self._time("normalize", started)
+        return result
+
+    def _get_observation(self):
+        """Normalize the batched simulator state like DinoEnv._get_observation."""
+        sim = self.sim
+        return {
+            "status": sim.status,
+            "distance": (sim.distance / 1000.0).astype(np.float32)[:, None],
+            "speed": (sim.speed / 10.0).astype(np.float32)[:, None],
+            "jump_velocity": (sim.jump_velocity / 50.0).astype(np.float32)[:, None],
+            "y_position": (sim.y_pos / 100.0).astype(np.float32)[:, None],
+            "obstacles": encode_obstacles(sim.obstacle_boxes(), sim.speed, self.max_obstacles,
+                                          self.obstacle_encoding)
+        }
+
+    def close(self):
+        pass
+
+
+class DinoAsyncVecEnv(DinoBaseVecEnv):
+    """Browser-backed VecEnv driving every DinoGame page concurrently from one event loop.
+
+    Pages come from a private BrowserPool whose loop runs in a background thread.
+    ``step_async`` schedules one ``asyncio.gather`` over all games and returns at
+    once, so policy inference overlaps with the browser work until ``step_wait``.
+
+    A game whose page times out or crashes gets a new page (its browser is retired)
+    and its episode is truncated without a penalty, with ``info["incident"]`` set.
+    """
+
+    def __init__(self, n_envs, verbose=False, max_steps=1000, headless=True, frame_skip=4,
+                 virtual_time=False, pages_per_browser=8, timeout=30.0, obs_mode="dict", profile=False,
+                 assets="http", command_timeout=DEFAULT_COMMAND_TIMEOUT, draw=True, browser_endpoint=None,
+                 perf_interval=0.0, max_obstacles=3, obstacle_encoding="raw"):
+        super().__init__(n_envs, verbose=verbose, max_steps=max_steps, obs_mode=obs_mode, profile=profile,
+                         max_obstacles=max_obstacles, obstacle_encoding=obstacle_encoding)
+        self.timeout = timeout
+        self.command_timeout = command_timeout
+        self.restarts = 0
+        self.perf_interval = perf_interval
+        self._pending = None
+        self._submitted = None
+
+        if assets == "http":
+            start_dino_server()
+        self.pool = BrowserPool(headless=headless, pages_per_browser=pages_per_browser, endpoint=browser_endpoint)
+        self._game_kwargs = dict(verbose=verbose, virtual_time=virtual_time, frame_skip=frame_skip,
+                                 pool=self.pool, timer=self.timer, assets=assets, draw=draw,
+                                 perf_interval=perf_interval)
+        self.games = [DinoGame(None, **self._game_kwargs) for _ in range(n_envs)]
+        self.pool.run(self._gather(game.init() for game in self.games), timeout=self.timeout)
+
+    @staticmethod
+    async def _gather(coros):
+        return await asyncio.gather(*coros)
+
+    @property
+    def perf(self):
+        """Latest browser performance sample of each game (see DinoGame.sample_perf)."""
+        return [game.perf for game in self.games] if self.perf_interval else None
+
+    def prewarm(self):
+        """Load every page concurrently so the first reset only starts the games."""
+        self.pool.run(self._gather(game.load() for game in self.games), timeout=self.timeout)
+
+    async def _retire(self, game):
+        """Close a game and stop the pool from handing out more pages of its browser."""
+        try:
+            await asyncio.wait_for(game.close(retire=True), self.command_timeout)
+        except Exception:
+            pass
+
+    async def _restart(self, i, command, error):
+        """Replace game ``i`` after its page got stuck or crashed; returns the incident.
+
+        A replacement page that doesn't load in time retires its browser too, and
+        the next of ``RESET_ATTEMPTS`` tries gets a page from another one.
+        """
+        self.restarts += 1
+        if self.verbose:
+            print(f"Env {i} {command} failed ({error}), restarting its page")
+        await self._retire(self.games[i])
+        for attempt in range(RESET_ATTEMPTS):
+            game = DinoGame(None, **self._game_kwargs)
+            try:
+                await asyncio.wait_for(game.init(), self.command_timeout)
+                await asyncio.wait_for(game.load(), self.command_timeout)
+                break
+            except Exception:
+                await self._retire(game)
+                if attempt == RESET_ATTEMPTS - 1:
+                    raise
+        self.games[i] = game
+        return {"command": command, "error": str(error) or type(error).__name__, "restarts": self.restarts, "action": "restart_page"}
+
+    async def _start(self, i, seed=None):
+        for attempt in range(RESET_ATTEMPTS):
+            game = self.games[i]
+            try:
+                await asyncio.wait_for(game.start_game(seed), self.timeout)
+                return game.check_state(await asyncio.wait_for(game.get_game_state(), self.command_timeout))
+            except Exception as e:
+                if attempt == RESET_ATTEMPTS - 1:
+                    raise
+                await self._restart(i, "reset", e)
+
+    async def _step(self, i, action, restart):
+        """Step one game; restart it right away if this step ends its episode."""
+        game = self.games[i]
+        try:
+            state = game.check_state(await asyncio.wait_for(game.step(action), self.command_timeout))
+        except Exception as e:
+            incident = await self._restart(i, "step", e)
+            return None, await self._start(i), incident
+        crashed = state is None or state["status"] == 3
+        reset_state = None
+        if crashed or restart:
+            reset_state = await self._start(i)
+        return state, reset_state, None
+
+    def reset(self):
+        """Restart every game concurrently and return the batched initial observation."""
+        if self._pending is not None:
+            try:
+                self._pending.result(self.timeout)
+            except Exception:
+                # Every game is restarted below anyway
+                self._pending.cancel()
+            self._pending = None
+        seeds = self._seeds
+        self._reset_seeds()
+        self._reset_options()
+
+        started = time.perf_counter()
+        states = self.pool.run(
+            self._gather(self._start(i, seed) for i, seed in enumerate(seeds)),
+            timeout=self.timeout)
+        self._time("reset", started)
+        self._reset_counters()
+        return self._format_observation(self._normalize_states(states))
+
+    def step_async(self, actions):
+        super().step_async(actions)
+        truncating = self.current_step + 1 >= self.max_steps
+        coros = (self._step(i, "jump" if action == 1 else "run", bool(restart))
+                 for i, (action, restart) in enumerate(zip(self.actions, truncating)))
+        self._pending = asyncio.run_coroutine_threadsafe(self._gather(coros), self.pool.loop)
+        self._submitted = time.perf_counter()
+
+    def step_wait(self):
+        started = time.perf_counter()
+        try:
+            results = self._pending.result(self.timeout)
+        except Exception:
+            # Leave the env usable: the next reset() starts from a clean slate
+            self._pending.cancel()
+            raise
+        finally:
+            self._pending = None
+        self.current_step += 1
+        self._time("gather_wait", started)
+        self._time("gather", self._submitted)
+
+        started = time.perf_counter()
+        observation = self._normalize_states([state for state, _, _ in results])
+        incidents = np.array([incident is not None for _, _, incident in results])
+        terminated = (observation["status"] == 3) & ~incidents
+        truncated = (self.current_step >= self.max_steps) | incidents
+        reset_observation = None
+        if (terminated | truncated).any():
+            reset_observation = self._normalize_states([reset_state for _, reset_state, _ in results])
+        observation, rewards, dones, infos = self._finish_step(observation, terminated, truncated, reset_observation)
+        for i in np.nonzero(incidents)[0]:
+            # Not the agent's doing: no reward either way for the lost step
+            rewards[i] = 0.0
+            infos[i]["incident"] = results[i][2]
+        if self.perf_interval:
+            for info, game in zip(infos, self.games):
+                info["perf"] = game.perf
+        self._time("normalize", started)
+        return observation, rewards, dones, infos
+
+    def close(self):
+        try:
+            self.pool.run(self._gather(game.close() for game in self.games), timeout=self.timeout)
+        finally:
+            self.pool.close()
+
+
+def _attach_shared_memory(name):
+    """Attach to a block created by the parent without letting this process unlink it."""
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: workers share the parent's resource tracker, where
+        # registering an existing block again is a no-op
+        return SharedMemory(name=name)
+
+
+def _shared_layout(observation_space):
+    """(key, shape, dtype) of each observation array; key is None for a Box space."""
+    if isinstance(observation_space, spaces.Dict):
+        return [(key, space.shape, np.dtype(space.dtype)) for key, space in observation_space.spaces.items()]
+    return [(None, observation_space.shape, np.dtype(observation_space.dtype))]
+
+
+def _shm_worker(remote, parent_remote, env_kwargs, n_local, cpus):
+    """Host ``n_local`` DinoEnvs, exchanging observations, rewards and dones through shared memory."""
+    parent_remote.close()
+    if cpus and hasattr(os, "sched_setaffinity"):
+        # Set before the envs start, so their browser processes inherit the same cores
+        os.sched_setaffinity(0, cpus)
+    envs = [gym.make('DinoRun-v0', **env_kwargs) for _ in range(n_local)]
+    remote.send((envs[0].observation_space, envs[0].action_space))
+
+    blocks = []
+    views = {}
+
+    def view(name, shape, dtype, start):
+        shm = _attach_shared_memory(name)
+        blocks.append(shm)
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf)[start:start + n_local]
+
+    def write_observation(j, observation):
+        for key, buffer in views["obs"].items():
+            buffer[j] = observation if key is None else observation[key]
+
+    while True:
+        try:
+            cmd, data = remote.recv()
+            if cmd == "attach":
+                layout, start = data
+                views = {name: view(*spec, start) for name, spec in layout.items() if name != "obs"}
+                views["obs"] = {key: view(*spec, start) for key, spec in layout["obs"].items()}
+                remote.send(None)
+            elif cmd == "step":
+                infos = []
+                for j, env in enumerate(envs):
+                    observation, reward, terminated, truncated, info = env.step(int(views["actions"][j]))
+                    done = terminated or truncated
+                    if done:
+                        info["TimeLimit.truncated"] = truncated and not terminated
+                        info["terminal_observation"] = observation
+                        observation, _ = env.reset()
+                        infos.append((j, info))
+                    write_observation(j, observation)
+                    views["rewards"][j] = reward
+                    views["dones"][j] = done
+                # Only finished episodes carry infos back over the pipe
+                remote.send(infos)
+            elif cmd == "reset":
+                reset_infos = []
+                for j, (env, (seed, options)) in enumerate(zip(envs, data)):
+                    observation, reset_info = env.reset(seed=seed, options=options)
+                    write_observation(j, observation)
+                    reset_infos.append(reset_info)
+                remote.send(reset_infos)
+            elif cmd == "get_attr":
+                remote.send([envs[j].get_wrapper_attr(data[0]) for j in data[1]])
+            elif cmd == "set_attr":
+                for j in data[2]:
+                    setattr(envs[j].unwrapped, data[0], data[1])
+                remote.send(None)
+            elif cmd == "env_method":
+                name, args, kwargs, indices = data
+                remote.send([envs[j].get_wrapper_attr(name)(*args, **kwargs) for j in indices])
+            elif cmd == "is_wrapped":
+                remote.send([is_wrapped(envs[j], data[0]) for j in data[1]])
+            elif cmd == "close":
+                for env in envs:
+                    env.close()
+                for shm in blocks:
+                    shm.close()
+                remote.close()
+                break
+            else:
+                raise NotImplementedError(f"`{cmd}` is not implemented in the shm worker")
+        except (EOFError, KeyboardInterrupt):
+            break
+
+
+class DinoShmVecEnv(VecEnv):
+    """Multi-process VecEnv where each worker process hosts several DinoEnvs.
+
+    Actions, observations, rewards and dones live in ``multiprocessing.shared_memory``
+    arrays; the pipes only carry the command and the infos of finished episodes,
+    so per-step infos are ``{}`` otherwise. Workers are pinned to disjoint sets
+    of cores when ``pin_cpus`` is set (Linux only).
+
+    The default start method is ``fork`` where available. Elsewhere (Windows,
+    macOS) workers are spawned and re-import the main module, so scripts using
+    this class need an ``if __name__ == "__main__"`` guard, as train.py has.
+    """
+
+    def __init__(self, n_envs, env_kwargs=None, n_workers=None, pin_cpus=True, start_method=None):
+        if hasattr(os, "sched_getaffinity"):
+            cpus = sorted(os.sched_getaffinity(0))
+        else:
+            cpus = list(range(os.cpu_count() or 1))
+        n_workers = min(n_envs, n_workers or len(cpus))
+        if start_method is None:
+            start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        ctx = multiprocessing.get_context(start_method)
+        # Forked workers only share the parent's tracker if it is already running
+        resource_tracker.ensure_running()
+
+        counts = [len(chunk) for chunk in np.array_split(np.arange(n_envs), n_workers)]
+        self._starts = np.cumsum([0] + counts[:-1]).tolist()
+        self._counts = counts
+        cores_per_worker = max(1, len(cpus) // n_workers)
+
+        self.remotes, self.processes = [], []
+        for i, count in enumerate(counts):
+            remote, work_remote = ctx.Pipe()
+            worker_cpus = None
+            if pin_cpus:
+                first = (i * cores_per_worker) % len(cpus)
+                worker_cpus = set(cpus[first:first + cores_per_worker])
+            process = ctx.Process(target=_shm_worker, daemon=True,
+                                  args=(work_remote, remote, dict(env_kwargs or {}), count, worker_cpus))
+            process.start()
+            work_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+
+        spaces_ = [remote.recv() for remote in self.remotes]
+        observation_space, action_space = spaces_[0]
+
+        # One shared block per array, each worker writing its own slice of rows
+        self._blocks = []
+        self._layout = {
+            "actions": self._allocate(n_envs, (), np.int64),
+            "rewards": self._allocate(n_envs, (), np.float32),
+            "dones": self._allocate(n_envs, (), np.bool_),
+            "obs": {key: self._allocate(n_envs, shape, dtype)
+                    for key, shape, dtype in _shared_layout(observation_space)},
+        }
+        self._arrays = {}
+        for name, spec in self._layout.items():
+            if name == "obs":
+                self._arrays["obs"] = {key: self._array(*value) for key, value in spec.items()}
+            else:
+                self._arrays[name] = self._array(*spec)
+        for remote, start in zip(self.remotes, self._starts):
+            remote.send(("attach", (self._layout, start)))
+        for remote in self.remotes:
+            remote.recv()
+
+        self.waiting = False
+        self.closed = False
+        super().__init__(n_envs, observation_space, action_space)
+
+    def _allocate(self, n_envs, shape, dtype):
+        shape = (n_envs,) + tuple(shape)
+        shm = SharedMemory(create=True, size=max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize))
+        self._blocks.append(shm)
+        return shm.name, shape, np.dtype(dtype)
+
+    def _array(self, name, shape, dtype):
+        shm = next(block for block in self._blocks if block.name == name)
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+
+    def _observation(self):
+        obs = self._arrays["obs"]
+        if None in obs:
+            return obs[None].copy()
+        return {key: value.copy() for key, value in obs.items()}
+
+    def _worker_indices(self, indices):
+        """Group global env indices as (remote, local indices) per worker."""
+        groups = {}
+        for i in self._get_indices(indices):
+            w = int(np.searchsorted(self._starts, i, side="right")) - 1
+            groups.setdefault(w, []).append(i - self._starts[w])
+        return [(self.remotes[w], local) for w, local in groups.items()]
+
+    def reset(self):
+        for remote, start, count in zip(self.remotes, self._starts, self._counts):
+            remote.send(("reset", [(self._seeds[i], self._options[i]) for i in range(start, start + count)]))
+        self.reset_infos = [info for remote in self.remotes for info in remote.recv()]
+        self._reset_seeds()
+        self._reset_options()
+        return self._observation()
+
+    def step_async(self, actions):
+        self._arrays["actions"][:] = np.asarray(actions).reshape(self.num_envs)
+        for remote in self.remotes:
+            remote.send(("step", None))
+        self.waiting = True
+
+    def step_wait(self):
+        infos = [{} for _ in range(self.num_envs)]
+        for remote, start in zip(self.remotes, self._starts):
+            for j, info in remote.recv():
+                infos[start + j] = info
+        self.waiting = False
+        return (self._observation(), self._arrays["rewards"].copy(),
+                self._arrays["dones"].copy(), infos)
+
+    def get_attr(self, attr_name, indices=None):
+        groups = self._worker_indices(indices)
+        for remote, local in groups:
+            remote.send(("get_attr", (attr_name, local)))
+        return [value for remote, _ in groups for value in remote.recv()]
+
+    def set_attr(self, attr_name, value, indices=None):
+        groups = self._worker_indices(indices)
+        for remote, local in groups:
+            remote.send(("set_attr", (attr_name, value, local)))
+        for remote, _ in groups:
+            remote.recv()
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        groups = self._worker_indices(indices)
+        for remote, local in groups:
+            remote.send(("env_method", (method_name, method_args, method_kwargs, local)))
+        return [value for remote, _ in groups for value in remote.recv()]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        groups = self._worker_indices(indices)
+        for remote, local in groups:
+            remote.send(("is_wrapped", (wrapper_class, local)))
+        return [value for remote, _ in groups for value in remote.recv()]
+
+    def close(self):
+        if self.closed:
+            return
+        if self.waiting:
+            for remote in self.remotes:
+                remote.recv()
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self._arrays = {}
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self.closed = True
+
+
+def make_dino_vec_env(n_envs, env_kwargs=None, seed=None, vec_env='dummy', record_dir=None):
+    """Create N Dino envs.
+
+    ``vec_env='shm'`` spreads DinoEnvs over worker processes with DinoShmVecEnv.
+    Otherwise the sim backend is always batched in DinoSimVecEnv. For the browser
+    backend, ``vec_env='async'`` drives all pages from one event loop with
+    DinoAsyncVecEnv, and ``'dummy'`` keeps SB3's make_vec_env with one DinoEnv per env.
+
+    With ``record_dir``, each DinoEnv is wrapped in a TrajectoryRecorder writing under
+    that directory; this needs ``vec_env='dummy'``.
+    """
+    env_kwargs = dict(env_kwargs or {})
+    if record_dir:
+        if vec_env != 'dummy':
+            raise ValueError("record_dir requires vec_env='dummy'")
+        return make_vec_env('DinoRun-v0', n_envs=n_envs, env_kwargs=env_kwargs, seed=seed,
+                            wrapper_class=TrajectoryRecorder, wrapper_kwargs={'root': record_dir})
+    if vec_env == 'shm':
+        env = DinoShmVecEnv(n_envs, env_kwargs=env_kwargs)
+        env.seed(seed)
+        return env
+    if env_kwargs.get('frame_history'):
+        # Frame history is tracked per DinoEnv; the batched envs don't record frames
+        if vec_env != 'dummy':
+            raise ValueError("frame_history requires vec_env='dummy' or 'shm'")
+        return make_vec_env('DinoRun-v0', n_envs=n_envs, env_kwargs=env_kwargs, seed=seed)
+    if env_kwargs.get('backend') == 'sim':
+        return DinoSimVecEnv(
+            n_envs,
+            verbose=env_kwargs.get('verbose', False),
+            max_steps=env_kwargs.get('max_steps', 1000),
+            frame_skip=env_kwargs.get('frame_skip', 4),
+            seed=seed,
+            obs_mode=env_kwargs.get('obs_mode', 'dict'),
+            profile=env_kwargs.get('profile', False),
+            max_obstacles=env_kwargs.get('max_obstacles', 3),
+            obstacle_encoding=env_kwargs.get('obstacle_encoding', 'raw'),
+        )
+    if vec_env == 'async':
+        env = DinoAsyncVecEnv(
+            n_envs,
+            verbose=env_kwargs.get('verbose', False),
+            max_steps=env_kwargs.get('max_steps', 1000),
+            headless=env_kwargs.get('headless', True),
+            frame_skip=env_kwargs.get('frame_skip', 4),
+            virtual_time=env_kwargs.get('virtual_time', False),
+            pages_per_browser=env_kwargs.get('pages_per_browser', 8),
+            obs_mode=env_kwargs.get('obs_mode', 'dict'),
+            profile=env_kwargs.get('profile', False),
+            assets=env_kwargs.get('assets', 'http'),
+            draw=env_kwargs.get('draw', True),
+            browser_endpoint=env_kwargs.get('browser_endpoint'),
+            perf_interval=env_kwargs.get('perf_interval', 0.0),
+            max_obstacles=env_kwargs.get('max_obstacles', 3),
+            obstacle_encoding=env_kwargs.get('obstacle_encoding', 'raw'),
+        )
+        env.seed(seed)
+        return env
+    return make_vec_env('DinoRun-v0', n_envs=n_envs, env_kwargs=env_kwargs, seed=seed)
+
+
+def prewarm_envs(env):
+    """Load the game page of every env concurrently, before training starts.
+
+    Accepts a gym env or a (possibly wrapped) VecEnv.
+    """
+    target = env.unwrapped
+    if isinstance(target, VecEnv) and not isinstance(target, DinoBaseVecEnv):
+        # One DinoEnv per sub-env: each prewarm returns at once and loads in the background
+        target.env_method("prewarm")
+    else:
+        target.prewarm()
@@ -0,0 +1,170 @@
+"""Batched evaluation of trained models.
+
+Spreads the evaluation episodes over N envs and calls ``model.predict`` once
+per step on the stacked observations, then writes the distance distribution
+of each checkpoint to a JSON file:
+
+    python evaluate.py --checkpoints "checkpoints/**/*.zip" --episodes 100 --n-envs 8
+
+NumPy exports from policy_export.py (.npz) are evaluated with NumpyPolicy.
+"""
+import argparse
+import glob
+import json
+import os
+import zipfile
+from datetime import datetime
+
+import numpy as np
+from dotenv import load_dotenv
+from stable_baselines3 import PPO, A2C, DQN
+
+from dino_vec_env import make_dino_vec_env, prewarm_envs
+from policy_export import NumpyPolicy
+
+MODELS = {'ppo': PPO, 'a2c': A2C, 'dqn': DQN}
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def load_model(path, algo):
+    if path.endswith(".npz"):
+        return NumpyPolicy.load(path)
+    return MODELS[algo].load(path, device='cpu')
+
+
+def env_kwargs_from_config():
+    """DinoEnv kwargs from .env.local, as in train.py."""
+    return {
+        'max_steps': int(os.getenv('MAX_STEPS', 1000)),
+        'headless': bool(int(os.getenv('HEADLESS', 1))),
+        'backend': os.getenv('BACKEND', 'browser'),
+        'frame_skip': int(os.getenv('FRAME_SKIP', 4)),
+        'virtual_time': bool(int(os.getenv('VIRTUAL_TIME', 0))),
+        'browser_pool': bool(int(os.getenv('BROWSER_POOL', 0))),
+        'pages_per_browser': int(os.getenv('PAGES_PER_BROWSER', 8)),
+        'frame_history': int(os.getenv('FRAME_HISTORY', 0)),
+        'obs_mode': os.getenv('OBS_MODE', 'dict'),
+        'assets': os.getenv('ASSETS', 'http'),
+        'frame_stack': int(os.getenv('FRAME_STACK', 4)),
+        'draw': bool(int(os.getenv('DRAW', 1))),
+        'browser_endpoint': os.getenv('BROWSER_ENDPOINT') or None,
+        'max_obstacles': int(os.getenv('MAX_OBSTACLES', 3)),
+        'obstacle_encoding': os.getenv('OBSTACLE_ENCODING', 'raw'),
+    }
+
+
+# Attributes SB3 saves in a checkpoint's "data" that only one of the algorithms has, checked in order
+ALGO_MARKERS = (('dqn', 'target_update_interval'), ('ppo', 'clip_range'), ('a2c', 'n_steps'))
+
+
+def infer_algo(path, default='ppo'):
+    """Algorithm of a checkpoint: from the attributes saved in the zip, else from its path.
+
+    final_model.zip and interrupted_model.zip carry no algorithm name, but the
+    run folders above them (e.g. ``dqn_1env/DQN_0``) do.
+    """
+    if path.endswith(".zip"):
+        try:
+            with zipfile.ZipFile(path) as archive:
+                data = json.loads(archive.read("data"))
+            for algo, marker in ALGO_MARKERS:
+                if marker in data:
+                    return algo
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            pass
+    for part in reversed(os.path.normpath(path).lower().split(os.sep)):
+        for algo in MODELS:
+            if algo in part:
+                return algo
+    return default
+
+
+def evaluate_model(model, env, n_episodes, deterministic=True):
+    """Play ``n_episodes`` over all envs of a VecEnv; returns final distances and truncation flags.
+
+    Each env plays a fixed share of the episodes, so the result isn't biased
+    towards short episodes.
+    """
+    n_envs = env.num_envs
+    targets = np.array([(n_episodes + i) // n_envs for i in range(n_envs)])
+    counts = np.zeros(n_envs, dtype=int)
+    distances, truncated = [], []
+
+    obs = env.reset()
+    while (counts < targets).any():
+        actions, _ = model.predict(obs, deterministic=deterministic)
+        obs, _, dones, infos = env.step(actions)
+        for i in np.nonzero(dones)[0]:
+            if counts[i] < targets[i]:
+                distances.append(round(infos[i]["distance"] * 1000))
+                truncated.append(bool(infos[i].get("TimeLimit.truncated", False)))
+                counts[i] += 1
+    return np.array(distances), np.array(truncated)
+
+
+def summarize_distances(distances, truncated):
+    summary = {
+        "episodes": int(len(distances)),
+        "mean": float(np.mean(distances)),
+        "std": float(np.std(distances)),
+        "best": int(np.max(distances)),
+        "worst": int(np.min(distances)),
+        "truncated": int(np.sum(truncated)),
+    }
+    for p, value in zip(PERCENTILES, np.percentile(distances, PERCENTILES)):
+        summary[f"p{p}"] = float(value)
+    return summary
+
+
+def main():
+    load_dotenv('.env.local')
+    parser = argparse.ArgumentParser(description="Evaluate Dino models over parallel envs")
+    parser.add_argument("--checkpoints", nargs="+", required=True,
+                        help="Model .zip/.npz files or glob patterns, e.g. 'checkpoints/**/*.zip'")
+    parser.add_argument("--algo", default=None, choices=list(MODELS),
+                        help="Algorithm of the checkpoints (default: from the checkpoint or its path, else ALGO)")
+    parser.add_argument("--episodes", type=int, default=100)
+    parser.add_argument("--n-envs", type=int, default=int(os.getenv('N_ENVS', 1)))
+    parser.add_argument("--vec-env", default=os.getenv('VEC_ENV', 'dummy'))
+    parser.add_argument("--seed", type=int, default=int(os.getenv('SEED', 0)))
+    parser.add_argument("--stochastic", action="store_true", help="Sample actions instead of argmax")
+    parser.add_argument("--output", default=None, help="JSON file (default: eval_results/<timestamp>.json)")
+    args = parser.parse_args()
+
+    paths = sorted({path for pattern in args.checkpoints for path in glob.glob(pattern, recursive=True)})
+    if not paths:
+        raise FileNotFoundError(f"No checkpoints match {args.checkpoints}")
+
+    env = make_dino_vec_env(args.n_envs, env_kwargs=env_kwargs_from_config(), seed=args.seed,
+                            vec_env=args.vec_env)
+    prewarm_envs(env)
+    results, failures = [], []
+    try:
+        for path in paths:
+            algo = args.algo or infer_algo(path, os.getenv('ALGO', 'ppo'))
+            try:
+                model = load_model(path, algo)
+                env.seed(args.seed)
+                distances, truncated = evaluate_model(model, env, args.episodes, deterministic=not args.stochastic)
+            except Exception as e:
+                # One unreadable or mismatched checkpoint shouldn't end the whole evaluation
+                print(f"{path}: skipped, {type(e).__name__}: {e}")
+                failures.append({"checkpoint": path, "algo": algo, "error": f"{type(e).__name__}: {e}"})
+                continue
+            summary = dict(checkpoint=path, algo=algo, **summarize_distances(distances, truncated))
+            results.append(summary)
+            print(f"{path}: mean {summary['mean']:.1f} | p50 {summary['p50']:.0f} | "
+                  f"p90 {summary['p90']:.0f} | best {summary['best']} over {summary['episodes']} episodes")
+    finally:
+        env.close()
+
+    output = args.output or os.path.join("eval_results", datetime.now().strftime("%Y%m%d_%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"n_envs": args.n_envs, "seed": args.seed, "deterministic": not args.stochastic,
+                   "results": results, "failures": failures}, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,90 +1,583 @@
 import time
 import asyncio
+import base64
+import mimetypes
 import threading
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urlparse
 import os
+import numpy as np
 from playwright.async_api import async_playwright
 
+GAME_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 't-rex-runner')
+
+# Origin intercepted with page routes when assets are served from memory
+MEMORY_URL = 'http://dino.local/'
+
 # Simple server management
-_server_started = False
+_server_url = None
 _server_lock = threading.Lock()
+_assets = None
+_assets_lock = threading.Lock()
 
-def start_dino_server():
-    """Start local HTTP server for Dino game."""
-    global _server_started
+def start_dino_server(port=0):
+    """Start local HTTP server for Dino game and return its URL.
+
+    The default port 0 binds a free ephemeral port, so several training jobs
+    can run on one host.
+    """
+    global _server_url
     with _server_lock:
-        if _server_started:
-            return
+        if _server_url:
+            return _server_url
             
-        web_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 't-rex-runner')
-        if not os.path.exists(web_dir):
-            raise FileNotFoundError(f"t-rex-runner directory not found at {web_dir}")
+        if not os.path.exists(GAME_DIR):
+            raise FileNotFoundError(f"t-rex-runner directory not found at {GAME_DIR}")
         
-        handler = lambda *args, **kwargs: SimpleHTTPRequestHandler(*args, directory=web_dir, **kwargs)
-        server = HTTPServer(("localhost", 8000), handler)
+        handler = lambda *args, **kwargs: SimpleHTTPRequestHandler(*args, directory=GAME_DIR, **kwargs)
+        server = ThreadingHTTPServer(("localhost", port), handler)
         thread = threading.Thread(target=server.serve_forever, daemon=True)
         thread.start()
-        _server_started = True
+        _server_url = f"http://localhost:{server.server_address[1]}/"
+        return _server_url
+
+def load_game_assets():
+    """Read every t-rex-runner file into memory once: {relative path: (body, content type)}.
+
+    Dot files and directories (a clone's .git/) are skipped.
+    """
+    global _assets
+    with _assets_lock:
+        if _assets is not None:
+            return _assets
+        if not os.path.exists(GAME_DIR):
+            raise FileNotFoundError(f"t-rex-runner directory not found at {GAME_DIR}")
+
+        assets = {}
+        for root, dirs, files in os.walk(GAME_DIR):
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            for name in files:
+                if name.startswith('.'):
+                    continue
+                path = os.path.join(root, name)
+                with open(path, 'rb') as f:
+                    body = f.read()
+                key = os.path.relpath(path, GAME_DIR).replace(os.sep, '/')
+                assets[key] = (body, mimetypes.guess_type(name)[0] or 'application/octet-stream')
+        _assets = assets
+        return _assets
+
+async def serve_game_asset(route, assets):
+    """Fulfill a request to MEMORY_URL from the in-memory assets."""
+    path = urlparse(route.request.url).path.lstrip('/')
+    if not path or path.endswith('/'):
+        path += 'index.html'
+    asset = assets.get(path)
+    if asset is None:
+        await route.fulfill(status=404)
+        return
+    body, content_type = asset
+    await route.fulfill(status=200, body=body, content_type=content_type)
+
+# Fixed time ArrowUp is held for a jump
+JUMP_HOLD_MS = 80
+JUMP_HOLD_FRAMES = round(JUMP_HOLD_MS * 60 / 1000)
+
+# Per-frame record layout: status, distance, speed, jump velocity, y position,
+# then (x, y, width, height) for the first 3 obstacles (states take all of them from the runner)
+FRAME_FIELDS = 17
+
+# Injected in record_frames mode: every Runner.update() frame is written into a
+# Float32Array ring buffer, drained as one base64 payload per state read
+RECORDER_JS = """
+(() => {
+    const FIELDS = 17;
+    const capacity = 512;
+    const buffer = new Float32Array(capacity * FIELDS);
+    const STATUS = {WAITING: 0, RUNNING: 1, JUMPING: 2, CRASHED: 3};
+    let written = 0;
+    let read = 0;
+
+    const record = runner => {
+        const offset = (written % capacity) * FIELDS;
+        const tRex = runner.tRex;
+        buffer.fill(0, offset, offset + FIELDS);
+        buffer[offset] = STATUS[tRex.status] ?? 1;
+        buffer[offset + 1] = Number(runner.distanceMeter.digits.join('')) || 0;
+        buffer[offset + 2] = runner.currentSpeed;
+        buffer[offset + 3] = tRex.jumpVelocity;
+        buffer[offset + 4] = tRex.yPos;
+        const obstacles = runner.horizon.obstacles;
+        for (let i = 0; i < Math.min(obstacles.length, 3); i++) {
+            const o = obstacles[i];
+            buffer.set([o.xPos, o.yPos, o.width, o.typeConfig?.height || 50], offset + 5 + i * 4);
+        }
+        written++;
+    };
+
+    document.addEventListener('DOMContentLoaded', () => {
+        const update = Runner.prototype.update;
+        Runner.prototype.update = function () {
+            const result = update.apply(this, arguments);
+            if (this.playing || this.crashed) record(this);
+            return result;
+        };
+    });
+
+    window.__dinoRecorder = {
+        pending() { return Math.min(written - read, capacity); },
+        // Drops frames not read yet, e.g. those of a finished episode
+        discard() { read = written; },
+        drain() {
+            const count = this.pending();
+            const out = new Float32Array(count * FIELDS);
+            for (let i = 0; i < count; i++) {
+                const offset = ((written - count + i) % capacity) * FIELDS;
+                out.set(buffer.subarray(offset, offset + FIELDS), i * FIELDS);
+            }
+            read = written;
+            const bytes = new Uint8Array(out.buffer);
+            let binary = '';
+            for (let i = 0; i < bytes.length; i += 0x8000) {
+                binary += String.fromCharCode.apply(null, bytes.subarray(i, i + 0x8000));
+            }
+            return btoa(binary);
+        }
+    };
+})();
+"""
+
+STATE_JS = """
+    () => {
+        const pixels = window.__dinoPixels ? window.__dinoPixels() : null;
+        const runner = Runner.instance_;
+        // Flat (x, y, width, height) rows for every obstacle on screen
+        const obstacles = runner && runner.horizon ? runner.horizon.obstacles.flatMap(o => [
+            o.xPos, o.yPos, o.width, o.typeConfig?.height || 50
+        ]) : null;
+
+        const recorder = window.__dinoRecorder;
+        // Frames only hold the first 3 obstacles; the current ones come from the runner
+        if (recorder && recorder.pending() > 0) return {frames: recorder.drain(), obstacles: obstacles, pixels: pixels};
+
+        if (!runner || !runner.tRex) return null;
+        
+        const distanceStr = runner.distanceMeter.digits.join('');
+                            
+        return {
+            distance: distanceStr,
+            status: runner.tRex.status,
+            speed: runner.currentSpeed,
+            jumpVelocity: runner.tRex.jumpVelocity,
+            yPos: runner.tRex.yPos,
+            obstacles: obstacles,
+            crashed: runner.crashed,
+            pixels: pixels
+        };
+    }
+"""
+
+# Same effect as holding ArrowUp for holdMs (Runner.onKeyDown/onKeyUp), then reads the state
+STEP_JS = """
+    async ([action, holdMs]) => {
+        const runner = Runner.instance_;
+        if (action === 'jump' && runner && runner.tRex) {
+            if (runner.playing && !runner.crashed && !runner.tRex.jumping && !runner.tRex.ducking) {
+                runner.tRex.startJump(runner.currentSpeed);
+            }
+            await new Promise(resolve => setTimeout(resolve, holdMs));
+            runner.tRex.endJump();
+        }
+        return (%s)();
+    }
+""" % STATE_JS.strip()
+
+WAIT_RUNNING_JS = """
+    async ([timeoutMs, settleMs]) => {
+        const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+        const start = performance.now();
+        while (performance.now() - start < timeoutMs) {
+            const runner = window.Runner && Runner.instance_;
+            if (runner && runner.tRex && runner.tRex.status === 'RUNNING' && !runner.crashed) {
+                await sleep(settleMs);
+                return true;
+            }
+            await sleep(10);
+        }
+        return false;
+    }
+"""
+
+# Injected before the game scripts in virtual-time mode: requestAnimationFrame and
+# performance.now are driven by __dinoClock.advance() instead of the wall clock
+VIRTUAL_TIME_JS = """
+(() => {
+    const frameMs = 1000 / 60;
+    let now = 0;
+    let nextId = 1;
+    let callbacks = new Map();
+    let releaseIn = 0;
+    let rngState = 0;
+
+    performance.now = () => now;
+    window.requestAnimationFrame = callback => {
+        const id = nextId++;
+        callbacks.set(id, callback);
+        return id;
+    };
+    window.cancelAnimationFrame = id => { callbacks.delete(id); };
+
+    // mulberry32, so obstacle generation is reproducible once seeded
+    const seededRandom = () => {
+        rngState = (rngState + 0x6D2B79F5) | 0;
+        let t = Math.imul(rngState ^ (rngState >>> 15), 1 | rngState);
+        t = (t + Math.imul(t ^ (t >>> 7), 61 | t)) ^ t;
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+
+    window.__dinoClock = {
+        advance(frames) {
+            for (let i = 0; i < frames; i++) {
+                now += frameMs;
+                const pending = callbacks;
+                callbacks = new Map();
+                pending.forEach(callback => callback(now));
+                if (releaseIn > 0 && --releaseIn === 0 && window.Runner && Runner.instance_) {
+                    Runner.instance_.tRex.endJump();
+                }
+            }
+        },
+        releaseJumpIn(frames) { releaseIn = frames; },
+        seed(seed) {
+            rngState = seed | 0;
+            Math.random = seededRandom;
+        }
+    };
+})();
+"""
+
+VIRTUAL_STEP_JS = """
+    ([action, frames, holdFrames]) => {
+        const runner = Runner.instance_;
+        if (action === 'jump' && runner && runner.tRex) {
+            if (runner.playing && !runner.crashed && !runner.tRex.jumping && !runner.tRex.ducking) {
+                runner.tRex.startJump(runner.currentSpeed);
+            }
+            window.__dinoClock.releaseJumpIn(holdFrames);
+        }
+        window.__dinoClock.advance(frames);
+        return (%s)();
+    }
+""" % STATE_JS.strip()
+
+# Advances frames until the t-rex lands from the start jump; the intro is a CSS
+# animation, so its end is still awaited on the wall clock
+VIRTUAL_START_JS = """
+    async ([maxFrames, settleFrames, introTimeoutMs]) => {
+        const clock = window.__dinoClock;
+        const runner = window.Runner && Runner.instance_;
+        if (!runner || !runner.tRex) return false;
+        // No virtual time passes after a crash, so the GAMEOVER_CLEAR_TIME keypress guard never clears
+        if (runner.crashed) runner.restart();
+        for (let i = 0; i < maxFrames; i++) {
+            if (runner.tRex.status === 'RUNNING' && !runner.crashed) break;
+            clock.advance(1);
+        }
+        const start = Date.now();
+        while (runner.playingIntro && Date.now() - start < introTimeoutMs) {
+            await new Promise(resolve => setTimeout(resolve, 10));
+        }
+        clock.advance(settleFrames);
+        return runner.tRex.status === 'RUNNING' && !runner.crashed;
+    }
+"""
+
+# Restarts a running or crashed game within one frame. Runner.restart() only runs
+# once stop() has cancelled the pending animation frame and cleared raqId
+RESTART_JS = """
+    (seed) => {
+        const runner = window.Runner && Runner.instance_;
+        if (!runner || !runner.tRex || !runner.activated || runner.playingIntro) return false;
+        const clock = window.__dinoClock;
+        if (clock) {
+            if (seed !== null) clock.seed(seed);
+            clock.releaseJumpIn(0);
+        }
+        runner.stop();
+        // Frames left from the previous episode must not reach the new one's history
+        if (window.__dinoRecorder) window.__dinoRecorder.discard();
+        runner.restart();
+        return runner.tRex.status === 'RUNNING' && !runner.crashed;
+    }
+"""
+
+# Injected when drawing is off: the game still runs Runner.update(), physics and
+# collision checks every frame, but the canvas clears and sprite blits become
+# no-ops. Only Runner is global, so the other prototypes are patched through the
+# first instance of each (the game over panel and first obstacle draw once).
+NO_DRAW_JS = """
+(() => {
+    const noop = function () {};
+    const targets = [
+        runner => runner.tRex,
+        runner => runner.distanceMeter,
+        runner => runner.horizon && runner.horizon.horizonLine,
+        runner => runner.horizon && runner.horizon.clouds && runner.horizon.clouds[0],
+        runner => runner.horizon && runner.horizon.obstacles && runner.horizon.obstacles[0],
+        runner => runner.horizon && runner.horizon.nightMode,
+        runner => runner.nightMode,
+        runner => runner.gameOverPanel,
+    ];
+    let pending = targets.slice();
+
+    const stubPending = runner => {
+        pending = pending.filter(target => {
+            const instance = target(runner);
+            if (!instance) return true;
+            const proto = Object.getPrototypeOf(instance);
+            if (typeof proto.draw === 'function') proto.draw = noop;
+            if (typeof proto.drawHighScore === 'function') proto.drawHighScore = noop;
+            return false;
+        });
+    };
+
+    document.addEventListener('DOMContentLoaded', () => {
+        Runner.prototype.clearCanvas = noop;
+        const update = Runner.prototype.update;
+        Runner.prototype.update = function () {
+            if (pending.length) stubPending(this);
+            return update.apply(this, arguments);
+        };
+    });
+})();
+"""
+
+# Injected when sampling browser performance: wall-clock gaps between game frames,
+# read and cleared by DinoGame.sample_perf. A gap over 1.5 frames means the
+# renderer missed animation frames and the game skipped ahead
+FRAME_STATS_JS = """
+(() => {
+    const frameMs = 1000 / 60;
+    let frames = 0;
+    let dropped = 0;
+    let maxGap = 0;
+    let last = null;
+
+    document.addEventListener('DOMContentLoaded', () => {
+        const update = Runner.prototype.update;
+        Runner.prototype.update = function () {
+            const now = Date.now();
+            if (this.playing && last !== null) {
+                const gap = now - last;
+                frames++;
+                if (gap > 1.5 * frameMs) dropped += Math.round(gap / frameMs) - 1;
+                maxGap = Math.max(maxGap, gap);
+            }
+            last = this.playing ? now : null;
+            return update.apply(this, arguments);
+        };
+    });
+
+    window.__dinoFrameStats = () => {
+        const stats = {frames: frames, dropped: dropped, maxGapMs: maxGap};
+        frames = dropped = maxGap = 0;
+        return stats;
+    };
+})();
+"""
+
+# Injected in pixel mode: scales the game canvas down on an offscreen canvas and
+# returns it as base64 grayscale bytes, so only height * width bytes leave the page
+PIXELS_JS = """
+((height, width) => {
+    let canvas = null;
+    let ctx = null;
+    const gray = new Uint8Array(height * width);
+
+    window.__dinoPixels = () => {
+        const runner = window.Runner && Runner.instance_;
+        if (!runner || !runner.canvas) return null;
+        if (!canvas) {
+            canvas = document.createElement('canvas');
+            canvas.width = width;
+            canvas.height = height;
+            ctx = canvas.getContext('2d', {willReadFrequently: true});
+        }
+        ctx.clearRect(0, 0, width, height);
+        ctx.drawImage(runner.canvas, 0, 0, width, height);
+        const rgba = ctx.getImageData(0, 0, width, height).data;
+        for (let i = 0, j = 0; i < gray.length; i++, j += 4) {
+            // The game canvas is transparent where nothing is drawn: blend over white
+            const luma = (rgba[j] * 77 + rgba[j + 1] * 150 + rgba[j + 2] * 29) >> 8;
+            gray[i] = 255 - ((rgba[j + 3] * (255 - luma)) / 255 | 0);
+        }
+        // In chunks, as in RECORDER_JS: one apply() over a large frame exceeds the argument limit
+        let binary = '';
+        for (let i = 0; i < gray.length; i += 0x8000) {
+            binary += String.fromCharCode.apply(null, gray.subarray(i, i + 0x8000));
+        }
+        return btoa(binary);
+    };
+})(%d, %d);
+"""
+
+def decode_pixels(payload, shape):
+    """Decode a base64 grayscale payload into a (height, width) uint8 array."""
+    return np.frombuffer(base64.b64decode(payload), dtype=np.uint8).reshape(shape)
+
+def decode_frames(payload):
+    """Decode a base64 recorder payload into a (frames, FRAME_FIELDS) float32 array."""
+    return np.frombuffer(base64.b64decode(payload), dtype='<f4').reshape(-1, FRAME_FIELDS)
+
+def frame_to_state(frame):
+    """Build a get_game_state dict from one recorded frame."""
+    return {
+        "status": int(frame[0]),
+        "distance": float(frame[1]),
+        "speed": float(frame[2]),
+        "jump_velocity": float(frame[3]),
+        "y_position": float(frame[4]),
+        "obstacles": frame[5:].reshape(-1, 4)
+    }
 
 class DinoGame:
     """Simple Playwright automation for Chrome Dino game."""
     
     STATUS_MAP = {'WAITING': 0, 'RUNNING': 1, 'JUMPING': 2, 'CRASHED': 3}
 
-    def __init__(self, browser, verbose=False):
+    def __init__(self, browser, verbose=False, virtual_time=False, frame_skip=4, pool=None,
+                 record_frames=False, timer=None, assets="http", pixel_shape=None, draw=True,
+                 perf_interval=0.0):
+        if assets not in ("http", "memory"):
+            raise ValueError(f"Unknown assets mode: {assets}")
+        if pixel_shape and not draw:
+            raise ValueError("Pixel observations need drawing enabled")
         self.browser = browser
         self.verbose = verbose
+        self.virtual_time = virtual_time
+        self.frame_skip = frame_skip
+        self.record_frames = record_frames
+        self.pool = pool
+        self.timer = timer  # Optional PhaseTimer for evaluate/parse/action latencies
+        self.assets = assets
+        self.pixel_shape = tuple(pixel_shape) if pixel_shape else None
+        self.draw = draw
         self.context = None
         self.page = None
+        self.loaded = False  # Set once the game page has been navigated to
+        self.failure = None  # Why the page last failed (crash, evaluate error), cleared by init()
+        self.perf_interval = perf_interval  # Seconds between browser perf samples, 0 = off
+        self.perf = None  # Latest sample_perf result
+        self._cdp = None
+        self._perf_metrics = None
+        self._perf_sampled = 0.0
+
+        # Scripts injected into every document before the game scripts run
+        self.init_scripts = []
+        if virtual_time:
+            self.init_scripts.append(VIRTUAL_TIME_JS)
+        if record_frames:
+            self.init_scripts.append(RECORDER_JS)
+        if pixel_shape:
+            self.init_scripts.append(PIXELS_JS % self.pixel_shape)
+        if not draw:
+            self.init_scripts.append(NO_DRAW_JS)
+        if perf_interval and not virtual_time:
+            # Off the wall clock no frames are dropped
+            self.init_scripts.append(FRAME_STATS_JS)
 
     async def init(self):
-        """Initialize browser context and page."""
-        self.context = await self.browser.new_context()
-        self.page = await self.context.new_page()
+        """Initialize browser context and page, from the shared pool if one is given."""
+        self.loaded = False
+        self.failure = None
+        if self.pool:
+            self.context, self.page = await self.pool.acquire(self.init_scripts)
+        else:
+            self.context = await self.browser.new_context()
+            for script in self.init_scripts:
+                await self.context.add_init_script(script)
+            self.page = await self.context.new_page()
+        self.page.on("crash", self._on_crash)
+        self._cdp = None
+        self._perf_metrics = None
+        if self.perf_interval:
+            self._cdp = await self.context.new_cdp_session(self.page)
+            await self._cdp.send("Performance.enable")
 
-    async def start_game(self):
-        """Start or restart the game."""
-        if not self.page:
-            raise RuntimeError("Call init() first")
-        
-        # Check if game is already loaded
+        if self.assets == "memory":
+            assets = load_game_assets()
+            await self.context.route(MEMORY_URL + '**', lambda route: serve_game_asset(route, assets))
+
+    def check_state(self, state):
+        """Return ``state``, raising if it is missing because the page failed."""
+        if state is None and self.failure:
+            raise RuntimeError(self.failure)
+        return state
+
+    def _on_crash(self, page):
+        self.failure = "page crashed"
+
+    async def load(self):
+        """Navigate to the game page unless it is already loaded."""
+        if self.loaded:
+            return
         try:
-            game_exists = await self.page.evaluate("() => !!Runner.instance_")
+            game_exists = await self.page.evaluate("() => !!window.Runner && !!Runner.instance_")
         except:
             game_exists = False
         
         if not game_exists:
-            # Load game page only if not already loaded
-            await self.page.goto('http://localhost:8000', wait_until='domcontentloaded')
+            url = MEMORY_URL if self.assets == "memory" else start_dino_server()
+            await self.page.goto(url, wait_until='domcontentloaded')
             await asyncio.sleep(0.2)
+        self.loaded = True
+
+    async def start_game(self, seed=None):
+        """Start or restart the game, seeding the obstacle generator in virtual-time mode.
+
+        Once the game has been started, resets call Runner.restart() in-page; the
+        keypress path is only used for the first start or if that fails.
+        """
+        if not self.page:
+            raise RuntimeError("Call init() first")
+        started = time.perf_counter()
+
+        restarted = False
+        if self.loaded:
+            try:
+                restarted = await self.page.evaluate(RESTART_JS, seed if self.virtual_time else None)
+            except Exception as e:
+                if self.verbose:
+                    print(f"Error restarting game: {e}")
+        if not restarted:
+            await self._start_from_keypress(seed)
+
+        if self.timer:
+            self.timer.stop("start_game", started)
+
+    async def _start_from_keypress(self, seed=None):
+        """Load the game page if needed, press Space and wait for the run to start."""
+        await self.load()
+        
+        if seed is not None and self.virtual_time:
+            await self.page.evaluate("(seed) => window.__dinoClock.seed(seed)", seed)
         
+        if self.record_frames:
+            # Drop frames of the previous episode, as RESTART_JS does
+            await self.page.evaluate("() => window.__dinoRecorder && window.__dinoRecorder.discard()")
+
         # Start/restart game
         await self.page.keyboard.press('Space')
         
-        # Wait for game to actually start running with clean state
-        for _ in range(20):  # Max 1 second wait
-            try:
-                state_check = await self.page.evaluate("""
-                    () => {
-                        const runner = Runner.instance_;
-                        if (!runner || !runner.tRex) return null;
-                        return {
-                            status: runner.tRex.status,
-                            distance: runner.distanceMeter.digits.join(''),
-                            crashed: runner.crashed
-                        };
-                    }
-                """)
-                
-                if (state_check and 
-                    state_check['status'] == 'RUNNING' and 
-                    not state_check['crashed']):
-                    await asyncio.sleep(0.1) 
-                    break
-                    
-                await asyncio.sleep(0.01)
-            except:
-                await asyncio.sleep(0.05)
+        # Wait in-page for the game to actually start running with clean state
+        try:
+            if self.virtual_time:
+                await self.page.evaluate(VIRTUAL_START_JS, [120, round(0.1 * 60), 1000])
+            else:
+                await self.page.evaluate(WAIT_RUNNING_JS, [1000, 100])
+        except Exception as e:
+            if self.verbose:
+                print(f"Error waiting for game start: {e}")
 
     async def get_game_state(self):
         """Get current game state."""
@@ -92,79 +585,158 @@ class DinoGame:
             return None
             
         try:
-            state_data = await self.page.evaluate("""
-                () => {
-                    const runner = Runner.instance_;
-                    if (!runner || !runner.tRex) return null;
-                    
-                    const distanceStr = runner.distanceMeter.digits.join('');
-                    const obstacles = runner.horizon.obstacles.map(o => ({
-                        x: o.xPos,
-                        y: o.yPos,
-                        width: o.width,
-                        height: o.typeConfig?.height || 50
-                    }));
-                                        
-                    return {
-                        distance: distanceStr,
-                        status: runner.tRex.status,
-                        speed: runner.currentSpeed,
-                        jumpVelocity: runner.tRex.jumpVelocity,
-                        yPos: runner.tRex.yPos,
-                        obstacles: obstacles,
-                        crashed: runner.crashed
-                    };
-                }
-            """)
-            
-            if not state_data:
-                return None
-            
-            # Pad obstacles to exactly 3
-            obstacles = state_data['obstacles']
-            while len(obstacles) < 3:
-                obstacles.append({"x": 0, "y": 0, "width": 0, "height": 0})
-            obstacles = obstacles[:3]  # Take only first 3
-            
-            # Flatten obstacle data
-            obstacle_features = []
-            for obs in obstacles:
-                obstacle_features.extend([obs["x"], obs["y"], obs["width"], obs["height"]])
-            
-            distance = float(state_data['distance']) if state_data['distance'] else 0.0
-            
-            return {
-                "status": self.STATUS_MAP[state_data['status']],
-                "distance": distance,
-                "speed": float(state_data['speed']),
-                "jump_velocity": float(state_data['jumpVelocity']),
-                "y_position": float(state_data['yPos']),
-                "obstacles": obstacle_features
-            }
-            
+            started = time.perf_counter()
+            state_data = await self.page.evaluate(STATE_JS)
+            return self._timed_parse(state_data, started)
         except Exception as e:
+            self.failure = str(e)
             if self.verbose:
                 print(f"Error getting game state: {e}")
             return None
 
+    async def step(self, action):
+        """Apply an action and return the resulting state in a single evaluate call."""
+        if not self.page:
+            return None
+
+        try:
+            started = time.perf_counter()
+            if self.virtual_time:
+                state_data = await self.page.evaluate(
+                    VIRTUAL_STEP_JS, [action, self.frame_skip, JUMP_HOLD_FRAMES])
+            else:
+                state_data = await self.page.evaluate(STEP_JS, [action, JUMP_HOLD_MS])
+            state = self._timed_parse(state_data, started)
+            if self._cdp and time.perf_counter() - self._perf_sampled >= self.perf_interval:
+                await self._try_sample_perf()
+            return state
+        except Exception as e:
+            self.failure = str(e)
+            if self.verbose:
+                print(f"Error stepping game: {e}")
+            return None
+
+    async def sample_perf(self):
+        """Sample renderer metrics over CDP into ``self.perf`` and return it.
+
+        Rates cover the time since the previous sample: ``*_load`` is busy time per
+        wall-clock second (1.0 = one full core), ``dropped_frame_rate`` is the
+        share of animation frames the game skipped.
+        """
+        started = time.perf_counter()
+        response = await self._cdp.send("Performance.getMetrics")
+        metrics = {metric["name"]: metric["value"] for metric in response["metrics"]}
+        frames = None
+        if not self.virtual_time:
+            frames = await self.page.evaluate("() => window.__dinoFrameStats ? window.__dinoFrameStats() : null")
+
+        perf = {"js_heap_mb": metrics.get("JSHeapUsedSize", 0.0) / 2**20}
+        previous = self._perf_metrics
+        elapsed = metrics["Timestamp"] - previous["Timestamp"] if previous else 0.0
+        if elapsed > 0:
+            for name, key in (("task_load", "TaskDuration"), ("script_load", "ScriptDuration"),
+                              ("cpu_load", "ProcessTime")):
+                if key in metrics and key in previous:
+                    perf[name] = (metrics[key] - previous[key]) / elapsed
+            if frames is not None:
+                perf["fps"] = frames["frames"] / elapsed
+                expected = frames["frames"] + frames["dropped"]
+                perf["dropped_frame_rate"] = frames["dropped"] / expected if expected else 0.0
+                perf["max_frame_gap_ms"] = frames["maxGapMs"]
+        self._perf_metrics = metrics
+        self._perf_sampled = time.perf_counter()
+        self.perf = perf
+        if self.timer:
+            self.timer.stop("perf_sample", started)
+        return perf
+
+    async def _try_sample_perf(self):
+        # Diagnostics only: a failed sample must not fail the step
+        try:
+            await self.sample_perf()
+        except Exception as e:
+            self._perf_sampled = time.perf_counter()
+            if self.verbose:
+                print(f"Error sampling browser metrics: {e}")
+
+    def _timed_parse(self, state_data, evaluate_started):
+        """Parse an evaluate result, recording evaluate and parse latencies if profiling."""
+        if not self.timer:
+            return self._parse_state(state_data)
+        parse_started = time.perf_counter()
+        self.timer.record("evaluate", parse_started - evaluate_started)
+        state = self._parse_state(state_data)
+        self.timer.stop("parse", parse_started)
+        return state
+
+    def _parse_state(self, state_data):
+        """Convert the raw in-page state into the observation-ready dict."""
+        if not state_data:
+            return None
+        
+        if 'frames' in state_data:
+            # Recorded frames: the newest one is the current state
+            frames = decode_frames(state_data['frames'])
+            state = frame_to_state(frames[-1])
+            if state_data.get('obstacles') is not None:
+                # Every obstacle on screen, not just the recorder's first 3
+                state["obstacles"] = np.array(state_data['obstacles'], dtype=np.float32).reshape(-1, 4)
+            state["frames"] = frames
+            return self._add_pixels(state, state_data)
+        
+        # All obstacles as (x, y, width, height) rows; the env's encoder picks and pads them
+        obstacles = np.array(state_data['obstacles'], dtype=np.float32).reshape(-1, 4)
+
+        distance = float(state_data['distance']) if state_data['distance'] else 0.0
+        
+        state = {
+            "status": self.STATUS_MAP[state_data['status']],
+            "distance": distance,
+            "speed": float(state_data['speed']),
+            "jump_velocity": float(state_data['jumpVelocity']),
+            "y_position": float(state_data['yPos']),
+            "obstacles": obstacles
+        }
+        if self.record_frames:
+            # No game frame ran since the last read
+            state["frames"] = np.zeros((0, FRAME_FIELDS), dtype=np.float32)
+        return self._add_pixels(state, state_data)
+
+    def _add_pixels(self, state, state_data):
+        if self.pixel_shape:
+            payload = state_data.get('pixels')
+            state["pixels"] = decode_pixels(payload, self.pixel_shape) if payload else None
+        return state
+
     async def send_action(self, action):
         """Send action to game."""
         if not self.page:
             return
             
+        started = time.perf_counter()
         try:
-            if action == "jump":
+            if self.virtual_time:
+                # Keyboard timing means nothing off the wall clock; advance frames instead
+                await self.page.evaluate(VIRTUAL_STEP_JS, [action, self.frame_skip, JUMP_HOLD_FRAMES])
+            elif action == "jump":
                 await self.page.keyboard.down("ArrowUp")
-                await asyncio.sleep(0.08)  # Fixed jump duration
+                await asyncio.sleep(JUMP_HOLD_MS / 1000)  # Fixed jump duration
                 await self.page.keyboard.up("ArrowUp")
             # "run" action does nothing (default state)
             
         except Exception as e:
             if self.verbose:
                 print(f"Error sending action: {e}")
+        if self.timer:
+            self.timer.stop("action", started)
 
-    async def close(self):
-        """Clean up resources."""
+    async def close(self, retire=False):
+        """Clean up resources; ``retire`` stops the pool from reusing this page's browser."""
+        if self.pool and self.context:
+            await self.pool.release(self.context, retire=retire)
+            self.page = None
+            self.context = None
+            return
         if self.page:
             await self.page.close()
             self.page = None
@@ -194,6 +766,127 @@ def get_browser(headless=True):
     playwright, browser = loop.run_until_complete(create_browser(headless))
     return browser
 
+class BrowserPool:
+    """Shared Chromium processes handing out isolated context/page pairs.
+
+    All Playwright objects are bound to the pool's own event loop, which runs in
+    a daemon thread; use ``run`` to execute coroutines on it from other threads.
+    With ``endpoint`` (a Chromium DevTools URL, e.g. from ``sweep.py``) the pool
+    connects to an existing browser over CDP instead of launching its own, so
+    several processes can share one Chromium.
+    """
+
+    def __init__(self, headless=True, pages_per_browser=8, recycle_after=256, endpoint=None):
+        self.headless = headless
+        self.endpoint = endpoint
+        self.pages_per_browser = pages_per_browser
+        self.recycle_after = recycle_after
+        self.playwright = None
+        self.browsers = []  # [browser, active pages, pages served]
+        self._owners = {}   # context -> browser entry
+        self._lock = asyncio.Lock()
+
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the pool loop and wait for its result."""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    async def _launch(self):
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+        if self.endpoint:
+            # Closing a CDP connection only disconnects; the shared browser keeps running
+            browser = await self.playwright.chromium.connect_over_cdp(self.endpoint)
+        else:
+            browser = await self.playwright.chromium.launch(
+                headless=self.headless,
+                args=["--no-sandbox", "--disable-dev-shm-usage", "--mute-audio"]
+            )
+        entry = [browser, 0, 0]
+        self.browsers.append(entry)
+        return entry
+
+    async def acquire(self, init_scripts=()):
+        """Create a fresh context and page on the least loaded browser."""
+        async with self._lock:
+            self.browsers = [e for e in self.browsers if e[0].is_connected()]
+            available = [e for e in self.browsers if e[1] < self.pages_per_browser]
+            entry = min(available, key=lambda e: e[1]) if available else await self._launch()
+            entry[1] += 1
+            entry[2] += 1
+
+        context = await entry[0].new_context()
+        for script in init_scripts:
+            await context.add_init_script(script)
+        page = await context.new_page()
+        self._owners[context] = entry
+        return context, page
+
+    async def release(self, context, retire=False):
+        """Close a context and retire its browser once it has served enough pages.
+
+        ``retire`` stops handing out pages from the context's browser right away,
+        e.g. after it hung; it is closed once its last page is released.
+        """
+        entry = self._owners.pop(context, None)
+        try:
+            await asyncio.wait_for(context.close(), 10)
+        except Exception:
+            pass
+        if entry is None:
+            return
+
+        async with self._lock:
+            entry[1] -= 1
+            # Recycle long-lived browsers to shed leaked renderer memory
+            recycle = self.recycle_after and entry[2] >= self.recycle_after
+            if (retire or (recycle and entry[1] == 0)) and entry in self.browsers:
+                self.browsers.remove(entry)
+            if entry[1] == 0 and entry not in self.browsers:
+                try:
+                    await asyncio.wait_for(entry[0].close(), 10)
+                except Exception:
+                    pass
+
+    def stats(self):
+        """Number of browser processes and pages currently handed out."""
+        return {
+            "browsers": len(self.browsers),
+            "pages": sum(entry[1] for entry in self.browsers)
+        }
+
+    async def _shutdown(self):
+        for entry in self.browsers:
+            await entry[0].close()
+        self.browsers = []
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+
+    def close(self):
+        """Close all browsers and stop the pool loop."""
+        self.run(self._shutdown())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_browser_pool(headless=True, pages_per_browser=8, endpoint=None):
+    """Process-wide browser pool, one per headless setting, pages per browser and CDP endpoint."""
+    key = (headless, pages_per_browser, endpoint)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = BrowserPool(headless=headless, pages_per_browser=pages_per_browser, endpoint=endpoint)
+        return _pools[key]
+
 if __name__ == "__main__":
     async def main():
         start_dino_server()
@@ -0,0 +1,82 @@
+"""Obstacle features of Dino observations.
+
+Game backends hand over obstacles as raw ``(x, y, width, height)`` rows, one
+per obstacle on screen; ``encode_obstacles`` turns a batch of them into the
+``obstacles`` observation in one set of NumPy operations, whatever the number
+of envs or ``max_obstacles``:
+
+- ``"raw"``: the first ``max_obstacles`` rows as is, zero padded (the original layout).
+- ``"relative"``: obstacles ahead of the t-rex sorted by distance, each as
+  (gap, time to impact, width, height, y). The gap is measured from the front
+  of the t-rex in canvas widths, sizes and y in canvas heights, and time to
+  impact in seconds at the current speed. Empty slots read as nothing for one
+  canvas width.
+"""
+import numpy as np
+from gymnasium import spaces
+from dino_sim import FPS, HEIGHT, TREX_WIDTH, TREX_X, WIDTH
+
+OBSTACLE_ENCODINGS = ("raw", "relative")
+RAW_FIELDS = ("x", "y", "width", "height")
+RELATIVE_FIELDS = ("gap", "time_to_impact", "width", "height", "y")
+# Seconds; also the value of empty slots
+MAX_TIME_TO_IMPACT = 5.0
+EMPTY_RELATIVE = np.array([1.0, MAX_TIME_TO_IMPACT, 0.0, 0.0, 0.0], dtype=np.float32)
+
+
+def check_encoding(encoding):
+    if encoding not in OBSTACLE_ENCODINGS:
+        raise ValueError(f"Unknown obstacle encoding: {encoding}")
+
+
+def obstacle_space(max_obstacles=3, encoding="raw"):
+    """Box of the ``obstacles`` observation."""
+    check_encoding(encoding)
+    if encoding == "raw":
+        return spaces.Box(low=-100, high=1000.0, shape=(max_obstacles * len(RAW_FIELDS),), dtype=np.float32)
+    low = np.array([-1.0, 0.0, 0.0, 0.0, 0.0], dtype=np.float32)
+    high = np.array([2.0, MAX_TIME_TO_IMPACT, 1.0, 1.0, 1.0], dtype=np.float32)
+    return spaces.Box(low=np.tile(low, max_obstacles), high=np.tile(high, max_obstacles), dtype=np.float32)
+
+
+def stack_obstacles(obstacles):
+    """Pad per-game (k_i, 4) obstacle arrays into one (n, max k_i, 4) array of zero-width rows."""
+    slots = max((len(rows) for rows in obstacles), default=0)
+    stacked = np.zeros((len(obstacles), slots, 4), dtype=np.float32)
+    for i, rows in enumerate(obstacles):
+        stacked[i, :len(rows)] = rows
+    return stacked
+
+
+def encode_obstacles(obstacles, speed, max_obstacles=3, encoding="raw"):
+    """Encode (n, k, 4) raw obstacle rows into (n, max_obstacles * fields) float32 features.
+
+    Rows with zero width are empty slots. ``speed`` is the raw game speed of
+    each game, in pixels per frame.
+    """
+    obstacles = np.asarray(obstacles, dtype=np.float32)
+    n, k = obstacles.shape[:2]
+    if k < max_obstacles:
+        obstacles = np.concatenate([obstacles, np.zeros((n, max_obstacles - k, 4), dtype=np.float32)], axis=1)
+
+    if encoding == "raw":
+        return obstacles[:, :max_obstacles].reshape(n, max_obstacles * len(RAW_FIELDS))
+    check_encoding(encoding)
+
+    x, y, width, height = np.moveaxis(obstacles, 2, 0)
+    # Obstacles the t-rex has fully passed no longer matter
+    ahead = (width > 0) & (x + width > TREX_X)
+    gap = np.where(ahead, x - (TREX_X + TREX_WIDTH), np.inf)
+    order = np.argsort(gap, axis=1, kind="stable")[:, :max_obstacles]
+    gap = np.take_along_axis(gap, order, axis=1)
+    present = np.isfinite(gap)
+
+    pixels_per_second = np.maximum(np.asarray(speed, dtype=np.float32), 1e-3)[:, None] * FPS
+    features = np.empty((n, max_obstacles, len(RELATIVE_FIELDS)), dtype=np.float32)
+    features[..., 0] = gap / WIDTH
+    features[..., 1] = np.minimum(np.maximum(gap, 0.0) / pixels_per_second, MAX_TIME_TO_IMPACT)
+    features[..., 2] = np.take_along_axis(width, order, axis=1) / HEIGHT
+    features[..., 3] = np.take_along_axis(height, order, axis=1) / HEIGHT
+    features[..., 4] = np.take_along_axis(y, order, axis=1) / HEIGHT
+    features[~present] = EMPTY_RELATIVE
+    return features.reshape(n, max_obstacles * len(RELATIVE_FIELDS))
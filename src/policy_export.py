@@ -0,0 +1,159 @@
+"""Export trained PPO/A2C policies to a NumPy-only forward pass.
+
+    python policy_export.py checkpoints/ppo_1env_2048steps/PPO_0/final_model.zip
+
+writes ``final_model.npz`` next to the checkpoint. ``NumpyPolicy.load`` runs it
+without importing torch or stable-baselines3.
+"""
+import argparse
+import json
+import os
+import numpy as np
+
+ACTIVATIONS = {
+    "tanh": np.tanh,
+    "relu": lambda x: np.maximum(x, 0.0),
+}
+
+
+def export_policy(checkpoint, output=None, algo="ppo"):
+    """Write the actor of a PPO/A2C checkpoint to ``output`` (.npz) and return its path.
+
+    The first linear layer is split per observation key, in the order the
+    policy's CombinedExtractor concatenates them. Discrete keys (the one-hot
+    ``status``) become lookup tables with the first bias folded in, so inference
+    indexes a column instead of building the one-hot vector.
+    """
+    import torch
+    from gymnasium import spaces
+    from stable_baselines3 import PPO, A2C
+
+    model = {"ppo": PPO, "a2c": A2C}[algo].load(checkpoint, device="cpu")
+    policy = model.policy
+    activation = {torch.nn.Tanh: "tanh", torch.nn.ReLU: "relu"}.get(policy.activation_fn)
+    if activation is None:
+        raise ValueError(f"Unsupported activation: {policy.activation_fn.__name__}")
+    if not isinstance(model.action_space, spaces.Discrete):
+        raise ValueError("Only Discrete action spaces can be exported")
+
+    linears = [layer for layer in policy.mlp_extractor.policy_net if isinstance(layer, torch.nn.Linear)]
+    linears.append(policy.action_net)
+    weights = [(layer.weight.detach().numpy().astype(np.float32), layer.bias.detach().numpy().astype(np.float32))
+               for layer in linears]
+
+    observation_space = model.observation_space
+    if isinstance(observation_space, spaces.Dict):
+        items = list(observation_space.spaces.items())
+    elif isinstance(observation_space, spaces.Box) and len(observation_space.shape) == 1:
+        items = [(None, observation_space)]
+    else:
+        raise ValueError("Image observations can't be exported; use a dict or flat observation policy")
+
+    arrays = {}
+    inputs = []
+    first_weight, first_bias = weights[0]
+    column = 0
+    for key, space in items:
+        name = key or "obs"
+        if isinstance(space, spaces.Discrete):
+            size = int(space.n)
+            arrays[f"table.{name}"] = first_weight[:, column:column + size].T.copy()
+            inputs.append({"key": key, "kind": "discrete", "size": size})
+        else:
+            size = int(np.prod(space.shape))
+            arrays[f"weight.{name}"] = first_weight[:, column:column + size].T.copy()
+            inputs.append({"key": key, "kind": "box", "size": size})
+        column += size
+    if column != first_weight.shape[1]:
+        raise ValueError(f"Observation size {column} doesn't match the policy input {first_weight.shape[1]}")
+    if not any(spec["kind"] == "discrete" for spec in inputs):
+        arrays["bias.0"] = first_bias
+    else:
+        # Fold the first bias into one of the lookup tables
+        table = next(f"table.{spec['key'] or 'obs'}" for spec in inputs if spec["kind"] == "discrete")
+        arrays[table] += first_bias
+
+    for i, (weight, bias) in enumerate(weights[1:], start=1):
+        arrays[f"weight.{i}"] = weight.T.copy()
+        arrays[f"bias.{i}"] = bias
+
+    meta = {"algo": algo, "activation": activation, "inputs": inputs, "layers": len(weights)}
+    output = output or os.path.splitext(checkpoint)[0] + ".npz"
+    np.savez(output, meta=np.array(json.dumps(meta)), **arrays)
+    return output
+
+
+class NumpyPolicy:
+    """Deterministic/stochastic actor from an exported .npz, with ``predict`` like SB3's."""
+
+    def __init__(self, meta, arrays, seed=None):
+        self.meta = meta
+        self.activation = ACTIVATIONS[meta["activation"]]
+        self.inputs = meta["inputs"]
+        self.first = [arrays[f"{'table' if spec['kind'] == 'discrete' else 'weight'}.{spec['key'] or 'obs'}"]
+                      for spec in self.inputs]
+        self.first_bias = arrays.get("bias.0")
+        self.layers = [(arrays[f"weight.{i}"], arrays[f"bias.{i}"]) for i in range(1, meta["layers"])]
+        self.rng = np.random.default_rng(seed)
+
+    @classmethod
+    def load(cls, path, seed=None):
+        with np.load(path) as data:
+            arrays = {key: data[key] for key in data.files if key != "meta"}
+            meta = json.loads(str(data["meta"]))
+        return cls(meta, arrays, seed=seed)
+
+    def logits(self, observation, batch_size=None):
+        """Action logits for a batch of observations (dict of arrays or a 2-D array).
+
+        A single unbatched observation is accepted with ``batch_size=1``.
+        """
+        hidden = None
+        for spec, weight in zip(self.inputs, self.first):
+            value = observation if spec["key"] is None else observation[spec["key"]]
+            if spec["kind"] == "discrete":
+                term = weight[np.asarray(value, dtype=np.int64).reshape(-1)]
+            else:
+                value = np.asarray(value, dtype=np.float32)
+                term = value.reshape(batch_size or len(value), -1) @ weight
+            hidden = term if hidden is None else hidden + term
+        if self.first_bias is not None:
+            hidden = hidden + self.first_bias
+        hidden = self.activation(hidden)
+        for i, (weight, bias) in enumerate(self.layers):
+            hidden = hidden @ weight + bias
+            if i < len(self.layers) - 1:
+                hidden = self.activation(hidden)
+        return hidden
+
+    def _is_single(self, observation):
+        spec = self.inputs[0]
+        value = observation if spec["key"] is None else observation[spec["key"]]
+        expected = 0 if spec["kind"] == "discrete" else 1
+        return np.ndim(value) == expected
+
+    def predict(self, observation, state=None, episode_start=None, deterministic=True):
+        """Same call and return shape as BaseAlgorithm.predict, for single or batched observations."""
+        single = self._is_single(observation)
+        logits = self.logits(observation, batch_size=1 if single else None)
+        if deterministic:
+            actions = logits.argmax(axis=1)
+        else:
+            probs = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probs /= probs.sum(axis=1, keepdims=True)
+            actions = (self.rng.random((len(probs), 1)) > probs.cumsum(axis=1)).sum(axis=1)
+            actions = np.minimum(actions, probs.shape[1] - 1)
+        return (actions[0] if single else actions), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a PPO/A2C checkpoint to a NumPy policy")
+    parser.add_argument("checkpoint")
+    parser.add_argument("output", nargs="?", default=None)
+    parser.add_argument("--algo", default="ppo", choices=["ppo", "a2c"])
+    args = parser.parse_args()
+    print(f"Exported to {export_policy(args.checkpoint, args.output, args.algo)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Parallel hyperparameter sweep over train.py runs.
+
+Each run is a ``train.py`` subprocess whose .env.local values are overridden
+through its environment. Runs are started as soon as their CPU cost fits in
+``--cpus`` (and their browser pages in ``--max-pages``):
+
+    python sweep.py --grid ALGO=ppo N_STEPS=1024,2048 ENT_COEF=0.01,0.03 --cpus 16
+    python sweep.py --configs sweep.json --share-browser
+
+``--configs`` takes a JSON list of override dicts. Every run gets its own
+RUN_NAME (``<sweep>_<index>``), so its checkpoints and TensorBoard logs never
+collide with another run's. With ``--share-browser`` all browser runs open
+their pages in one Chromium started by the sweep instead of one per run.
+Logs and a ``results.json`` summary go to ``sweeps/<sweep>/``.
+"""
+import argparse
+import itertools
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime
+
+from dotenv import dotenv_values
+
+CONFIG_FILE = '.env.local'
+TRAIN_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'train.py')
+# Overrides applied to every run before its own
+RUN_DEFAULTS = {'HEADLESS': '1', 'CONTINUE_MODE': 'false', 'VERBOSE': '0'}
+
+
+def parse_grid(items):
+    """['ALGO=ppo', 'N_STEPS=1024,2048'] -> list of override dicts (cartesian product)."""
+    axes = []
+    for item in items:
+        key, sep, values = item.partition('=')
+        if not sep or not values:
+            raise ValueError(f"Grid entries look like KEY=v1,v2: {item!r}")
+        axes.append([(key, value) for value in values.split(',')])
+    return [dict(combination) for combination in itertools.product(*axes)]
+
+
+def load_configs(path):
+    with open(path) as f:
+        configs = json.load(f)
+    if not isinstance(configs, list) or not all(isinstance(config, dict) for config in configs):
+        raise ValueError(f"{path} must hold a JSON list of override dicts")
+    return [{key: str(value) for key, value in config.items()} for config in configs]
+
+
+def run_cost(config, cpus):
+    """(CPUs, browser pages) one run needs: a core for the learner plus its envs.
+
+    Browser envs each keep a Chromium renderer busy; the sim backend steps all
+    envs in the learner process, except with VEC_ENV=shm, which adds workers.
+    """
+    n_envs = int(config.get('N_ENVS') or 1)
+    if config.get('ALGO') == 'dqn':
+        n_envs = 1  # train.py runs DQN on a single env
+    if config.get('BACKEND', 'browser') == 'browser':
+        return 1 + n_envs, n_envs
+    if config.get('VEC_ENV') == 'shm':
+        return 1 + min(n_envs, cpus), 0
+    return 1, 0
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def launch_shared_browser(headless=True, timeout=30.0):
+    """Start a Chromium that runs can reach over CDP; returns (playwright, browser, endpoint)."""
+    from playwright.sync_api import sync_playwright
+
+    port = free_port()
+    playwright = sync_playwright().start()
+    browser = playwright.chromium.launch(
+        headless=headless,
+        args=["--no-sandbox", "--disable-dev-shm-usage", "--mute-audio", f"--remote-debugging-port={port}"]
+    )
+    endpoint = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            urllib.request.urlopen(endpoint + "/json/version", timeout=1).close()
+            return playwright, browser, endpoint
+        except OSError:
+            if time.monotonic() > deadline:
+                browser.close()
+                playwright.stop()
+                raise RuntimeError(f"Shared browser didn't open its DevTools port {port}")
+            time.sleep(0.1)
+
+
+class SweepScheduler:
+    """Runs train.py for each config, as many at once as the CPU/page budget allows.
+
+    Runs start in order; a run that doesn't fit waits while smaller later ones
+    may go ahead. A run bigger than the whole budget starts once nothing else is
+    running.
+    """
+
+    def __init__(self, configs, name, cpus, max_pages=None, extra_env=None, poll_interval=1.0):
+        self.name = name
+        self.cpus = cpus
+        self.max_pages = max_pages
+        self.extra_env = extra_env or {}
+        self.poll_interval = poll_interval
+        self.directory = os.path.join('sweeps', name)
+        base = {key: value for key, value in dotenv_values(CONFIG_FILE).items() if value is not None}
+        self.runs = []
+        for index, overrides in enumerate(configs):
+            config = dict(base, **RUN_DEFAULTS, **overrides)
+            cost = run_cost(config, cpus)
+            self.runs.append({"name": f"{name}_{index}", "overrides": overrides, "config": config,
+                              "cpus": cost[0], "pages": cost[1]})
+
+    def _fits(self, run, running):
+        if not running:
+            return True
+        cpus = sum(r["cpus"] for r in running) + run["cpus"]
+        pages = sum(r["pages"] for r in running) + run["pages"]
+        return cpus <= self.cpus and (self.max_pages is None or pages <= self.max_pages)
+
+    def _start(self, run):
+        env = dict(os.environ, **run["config"], **self.extra_env, RUN_NAME=run["name"])
+        run["log"] = os.path.join(self.directory, f"{run['name']}.log")
+        run["log_file"] = open(run["log"], "w")
+        run["started"] = time.time()
+        run["process"] = subprocess.Popen([sys.executable, TRAIN_SCRIPT], env=env, stdout=run["log_file"],
+                                          stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+        print(f"[{run['name']}] started ({run['cpus']} CPUs) {run['overrides']}")
+
+    def _finish(self, run):
+        run["log_file"].close()
+        run["returncode"] = run["process"].returncode
+        run["duration_s"] = time.time() - run["started"]
+        status = "done" if run["returncode"] == 0 else f"FAILED ({run['returncode']}), see {run['log']}"
+        print(f"[{run['name']}] {status} in {run['duration_s'] / 60:.1f} min")
+
+    def run(self):
+        os.makedirs(self.directory, exist_ok=True)
+        pending = list(self.runs)
+        running = []
+        try:
+            while pending or running:
+                for run in list(pending):
+                    if self._fits(run, running):
+                        pending.remove(run)
+                        self._start(run)
+                        running.append(run)
+                time.sleep(self.poll_interval)
+                for run in list(running):
+                    if run["process"].poll() is not None:
+                        running.remove(run)
+                        self._finish(run)
+        except KeyboardInterrupt:
+            print("Sweep interrupted, stopping runs...")
+            for run in running:
+                run["process"].terminate()
+            for run in running:
+                run["process"].wait()
+                self._finish(run)
+        return self.write_results()
+
+    def write_results(self):
+        path = os.path.join(self.directory, "results.json")
+        results = [{key: run.get(key) for key in ("name", "overrides", "cpus", "pages", "returncode",
+                                                   "duration_s", "log")}
+                   for run in self.runs]
+        with open(path, "w") as f:
+            json.dump({"sweep": self.name, "cpus": self.cpus, "max_pages": self.max_pages,
+                       "runs": results}, f, indent=2)
+        return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run train.py over a grid or list of configs in parallel")
+    parser.add_argument("--grid", nargs="+", default=[], help="KEY=v1,v2 axes, e.g. N_STEPS=1024,2048")
+    parser.add_argument("--configs", default=None, help="JSON list of override dicts")
+    parser.add_argument("--cpus", type=int, default=os.cpu_count(), help="CPU budget shared by concurrent runs")
+    parser.add_argument("--max-pages", type=int, default=None, help="Browser pages allowed at once")
+    parser.add_argument("--share-browser", action="store_true",
+                        help="Run every browser env in one Chromium started by the sweep")
+    parser.add_argument("--name", default=None, help="Sweep name (default: sweep_<timestamp>)")
+    parser.add_argument("--dry-run", action="store_true", help="Print the runs and their cost only")
+    args = parser.parse_args()
+
+    configs = parse_grid(args.grid) if args.grid else []
+    if args.configs:
+        configs += load_configs(args.configs)
+    if not configs:
+        parser.error("give --grid and/or --configs")
+
+    name = args.name or datetime.now().strftime("sweep_%Y%m%d_%H%M%S")
+    scheduler = SweepScheduler(configs, name, cpus=args.cpus, max_pages=args.max_pages)
+    if args.dry_run:
+        for run in scheduler.runs:
+            print(f"{run['name']}: {run['cpus']} CPUs, {run['pages']} pages {run['overrides']}")
+        return
+
+    shared = None
+    if args.share_browser and any(run["pages"] for run in scheduler.runs):
+        shared = launch_shared_browser()
+        scheduler.extra_env["BROWSER_ENDPOINT"] = shared[2]
+        print(f"Sharing browser at {shared[2]}")
+    try:
+        print(f"Results written to {scheduler.run()}")
+    finally:
+        if shared:
+            shared[1].close()
+            shared[0].stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,20 @@
-from stable_baselines3 import PPO
 import dino_env  # This registers the environment
 import gymnasium as gym
 import os
 
 # Load headless setting from environment variable
 HEADLESS = int(os.getenv('HEADLESS', 1))  # 1=headless, 0=visual
+POLICY = os.getenv('POLICY', 'torch')  # torch=SB3 checkpoint, numpy=policy_export.py .npz
+CHECKPOINT = "checkpoints/ppo_1env_2048steps/dino_model_ppo_1env_2048steps_final.zip"
 
 # Load the environment and trained model
 env = gym.make('DinoRun-v0', headless=bool(HEADLESS))  # Enable rendering for visualization
-model = PPO.load("checkpoints/ppo_1env_2048steps/dino_model_ppo_1env_2048steps_final.zip")
+if POLICY == 'numpy':
+    from policy_export import NumpyPolicy
+    model = NumpyPolicy.load(os.getenv('POLICY_PATH', os.path.splitext(CHECKPOINT)[0] + ".npz"))
+else:
+    from stable_baselines3 import PPO
+    model = PPO.load(CHECKPOINT)
 
 # Test the model
 obs, _ = env.reset()
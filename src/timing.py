@@ -0,0 +1,134 @@
+import time
+import numpy as np
+from stable_baselines3.common.callbacks import BaseCallback
+
+
+class PhaseTimer:
+    """Low-overhead latency recorder keeping the last ``capacity`` samples per phase.
+
+    Samples go into preallocated ring buffers; percentiles are only computed
+    when ``summary`` is called.
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self._samples = {}
+        self._counts = {}
+
+    def record(self, phase, seconds):
+        """Record one duration, in seconds, for ``phase``."""
+        samples = self._samples.get(phase)
+        if samples is None:
+            samples = self._samples[phase] = np.zeros(self.capacity, dtype=np.float64)
+            self._counts[phase] = 0
+        count = self._counts[phase]
+        samples[count % self.capacity] = seconds
+        self._counts[phase] = count + 1
+
+    def start(self):
+        return time.perf_counter()
+
+    def stop(self, phase, started):
+        """Record the time elapsed since ``started`` (from ``start``) for ``phase``."""
+        self.record(phase, time.perf_counter() - started)
+
+    def samples(self, phase):
+        count = self._counts.get(phase, 0)
+        return self._samples[phase][:min(count, self.capacity)] if count else np.zeros(0)
+
+    def phases(self):
+        return list(self._samples)
+
+    def reset(self):
+        for phase in self._counts:
+            self._counts[phase] = 0
+
+    def summary(self, percentiles=(50, 90, 99)):
+        return summarize_timers([self], percentiles)
+
+
+def summarize_timers(timers, percentiles=(50, 90, 99)):
+    """Merge the samples of several PhaseTimers into per-phase millisecond statistics."""
+    merged = {}
+    for timer in timers:
+        for phase in timer.phases():
+            merged.setdefault(phase, []).append(timer.samples(phase))
+
+    summary = {}
+    for phase, chunks in merged.items():
+        samples = np.concatenate(chunks) * 1000.0
+        if not samples.size:
+            continue
+        stats = {"count": int(samples.size), "mean_ms": float(samples.mean())}
+        for p, value in zip(percentiles, np.percentile(samples, percentiles)):
+            stats[f"p{p}_ms"] = float(value)
+        summary[phase] = stats
+    return summary
+
+
+def summarize_perf(samples):
+    """Mean and max over envs of each browser perf metric (DinoGame.sample_perf)."""
+    values = {}
+    for sample in samples:
+        for name, value in sample.items():
+            values.setdefault(name, []).append(value)
+    return {name: {"mean": float(np.mean(v)), "max": float(np.max(v))} for name, v in values.items()}
+
+
+class TimingCallback(BaseCallback):
+    """Logs env phase latencies and rollout/update wall time to TensorBoard.
+
+    Env timings come from the ``timer`` attribute of each env (DinoEnv or a Dino
+    VecEnv created with ``profile=True``); they are summarized and cleared
+    every ``log_freq`` calls. Browser envs created with ``perf_interval`` also
+    get their latest renderer metrics logged under ``browser/``.
+    """
+
+    def __init__(self, log_freq=1000, verbose=0):
+        super().__init__(verbose)
+        self.log_freq = log_freq
+        self._rollout_started = None
+        self._update_started = None
+
+    def _on_rollout_start(self):
+        now = time.perf_counter()
+        if self._update_started is not None:
+            self.logger.record("timing/update_s", now - self._update_started)
+        self._rollout_started = now
+
+    def _on_rollout_end(self):
+        now = time.perf_counter()
+        if self._rollout_started is not None:
+            self.logger.record("timing/rollout_s", now - self._rollout_started)
+        self._update_started = now
+
+    def _on_step(self):
+        if self.n_calls % self.log_freq == 0:
+            self._log_env_timings()
+            self._log_browser_perf()
+        return True
+
+    def _log_env_timings(self):
+        timers = {}
+        for timer in self.training_env.get_attr("timer"):
+            if timer is not None:
+                timers[id(timer)] = timer
+        if not timers:
+            return
+
+        for phase, stats in summarize_timers(timers.values()).items():
+            for name, value in stats.items():
+                if name != "count":
+                    self.logger.record(f"timing/{phase}_{name}", value)
+        self.training_env.env_method("reset_timings")
+
+    def _log_browser_perf(self):
+        samples = {}
+        for perf in self.training_env.get_attr("perf"):
+            # A DinoEnv has one sample, DinoAsyncVecEnv a list for all of its games
+            for sample in (perf if isinstance(perf, list) else [perf]):
+                if sample:
+                    samples[id(sample)] = sample
+        for name, stats in summarize_perf(samples.values()).items():
+            self.logger.record(f"browser/{name}_mean", stats["mean"])
+            self.logger.record(f"browser/{name}_max", stats["max"])
@@ -1,12 +1,16 @@
 from stable_baselines3 import PPO, A2C, DQN
-from stable_baselines3.common.env_util import make_vec_env
-from stable_baselines3.common.callbacks import CheckpointCallback
+from stable_baselines3.common.callbacks import CheckpointCallback, CallbackList
 from stable_baselines3.common.vec_env import VecMonitor
 from stable_baselines3.common.monitor import Monitor
+from stable_baselines3.common.logger import configure
 from dotenv import load_dotenv
 import os
 import gymnasium as gym
 import dino_env
+from dino_vec_env import make_dino_vec_env, prewarm_envs
+from timing import TimingCallback
+from replay_buffer import DinoReplayBuffer
+from trajectory import TrajectoryRecorder
 
 # Load config
 load_dotenv('.env.local')
@@ -20,6 +24,24 @@ VERBOSE = int(os.getenv('VERBOSE'))
 DEVICE = os.getenv('DEVICE')
 LOG_INTERVAL = int(os.getenv('LOG_INTERVAL'))
 HEADLESS = int(os.getenv('HEADLESS'))
+BACKEND = os.getenv('BACKEND', 'browser')
+FRAME_SKIP = int(os.getenv('FRAME_SKIP', 4))
+VIRTUAL_TIME = int(os.getenv('VIRTUAL_TIME', 0))
+BROWSER_POOL = int(os.getenv('BROWSER_POOL', 0))
+PAGES_PER_BROWSER = int(os.getenv('PAGES_PER_BROWSER', 8))
+VEC_ENV = os.getenv('VEC_ENV', 'dummy')
+FRAME_HISTORY = int(os.getenv('FRAME_HISTORY', 0))
+OBS_MODE = os.getenv('OBS_MODE', 'dict')
+PROFILE = int(os.getenv('PROFILE', 0))
+ASSETS = os.getenv('ASSETS', 'http')
+RECORD_DIR = os.getenv('RECORD_DIR') or None
+FRAME_STACK = int(os.getenv('FRAME_STACK', 4))
+DRAW = int(os.getenv('DRAW', 1))
+RUN_NAME = os.getenv('RUN_NAME') or None
+BROWSER_ENDPOINT = os.getenv('BROWSER_ENDPOINT') or None
+PERF_INTERVAL = float(os.getenv('PERF_INTERVAL', 0))
+MAX_OBSTACLES = int(os.getenv('MAX_OBSTACLES', 3))
+OBSTACLE_ENCODING = os.getenv('OBSTACLE_ENCODING', 'raw')
 
 # Algorithm-specific parameters
 if ALGO == 'dqn':
@@ -36,89 +58,135 @@ else:
 # Setup paths
 checkpoint_base = f"./checkpoints/{model_name}"
 tensorboard_base = f"./tensorboard_logs/{model_name}"
-os.makedirs(checkpoint_base, exist_ok=True)
 
-env_kwargs = {'verbose': VERBOSE > 1, 'max_steps': MAX_STEPS, 'headless': bool(HEADLESS)}
+env_kwargs = {
+    'verbose': VERBOSE > 1, 'max_steps': MAX_STEPS, 'headless': bool(HEADLESS),
+    'backend': BACKEND, 'frame_skip': FRAME_SKIP, 'virtual_time': bool(VIRTUAL_TIME),
+    'browser_pool': bool(BROWSER_POOL), 'pages_per_browser': PAGES_PER_BROWSER,
+    'frame_history': FRAME_HISTORY, 'obs_mode': OBS_MODE, 'profile': bool(PROFILE),
+    'assets': ASSETS, 'frame_stack': FRAME_STACK, 'draw': bool(DRAW),
+    'browser_endpoint': BROWSER_ENDPOINT, 'perf_interval': PERF_INTERVAL,
+    'max_obstacles': MAX_OBSTACLES, 'obstacle_encoding': OBSTACLE_ENCODING
+}
 
-# Create environment
-if ALGO in ['ppo', 'a2c']:
-    env = make_vec_env('DinoRun-v0', n_envs=N_ENVS, env_kwargs=env_kwargs, seed=SEED)
-    env = VecMonitor(env)
-else:
-    env = Monitor(gym.make('DinoRun-v0', **env_kwargs))
-
-# Get run number using TensorBoard's exact logic - find highest existing number + 1
-if os.path.exists(tensorboard_base):
-    existing_runs = [d for d in os.listdir(tensorboard_base) if d.startswith(ALGO.upper() + "_")]
-    if existing_runs:
-        # Extract numbers and find the highest
-        numbers = []
-        for run in existing_runs:
+def claim_run_folder():
+    """Create this run's TensorBoard folder and return its name.
+
+    RUN_NAME is used as is (sweep.py gives each run a unique one), or as
+    RUN_NAME_1, RUN_NAME_2... if an earlier run already took it. Otherwise the
+    next free ALGO_N is picked like TensorBoard does, claimed with an atomic
+    makedirs so concurrent runs can't end up in the same folder.
+    """
+    if RUN_NAME:
+        run_folder, suffix = RUN_NAME, 0
+        while True:
             try:
-                num = int(run.split("_")[1])
-                numbers.append(num)
-            except (IndexError, ValueError):
-                continue
-        run_number = max(numbers) + 1 if numbers else 0
-    else:
-        run_number = 0
-else:
+                os.makedirs(os.path.join(tensorboard_base, run_folder))
+                return run_folder
+            except FileExistsError:
+                suffix += 1
+                run_folder = f"{RUN_NAME}_{suffix}"
     run_number = 0
+    if os.path.exists(tensorboard_base):
+        # Highest existing number + 1
+        for run in os.listdir(tensorboard_base):
+            prefix, _, number = run.rpartition("_")
+            if prefix == ALGO.upper() and number.isdigit():
+                run_number = max(run_number, int(number) + 1)
+    while True:
+        run_folder = f"{ALGO.upper()}_{run_number}"
+        try:
+            os.makedirs(os.path.join(tensorboard_base, run_folder))
+            return run_folder
+        except FileExistsError:
+            run_number += 1
 
-run_folder = f"{ALGO.upper()}_{run_number}"
-checkpoint_path = os.path.join(checkpoint_base, run_folder)
-os.makedirs(checkpoint_path, exist_ok=True)
-
-# Model creation
-models = {'ppo': PPO, 'a2c': A2C, 'dqn': DQN}
-if ALGO not in models:
-    raise ValueError(f"Unknown algorithm: {ALGO}")
-
-if CONTINUE_MODE:
-    model_file = input("Enter model file path: ").strip()
-    model = models[ALGO].load(model_file)
-    model.set_env(env)
-    model.tensorboard_log = tensorboard_base
-    print(f"Loaded {ALGO.upper()} model from: {model_file}")
-else:
-    model_args = {
-        "policy": "MultiInputPolicy",
-        "env": env,
-        "verbose": VERBOSE,
-        "tensorboard_log": tensorboard_base,
-        "device": DEVICE,
-        "seed": SEED
-    }
-    if ALGO != 'dqn':
-        model_args["n_steps"] = N_STEPS
-    if ALGO == 'ppo':
-        model_args.update({"learning_rate": 5e-4, "batch_size": BATCH_SIZE, "ent_coef": ENT_COEF})
-    
-    model = models[ALGO](**model_args)
-
-# Setup callbacks with matching path
-checkpoint_callback = CheckpointCallback(
-    save_freq=25000,
-    save_path=checkpoint_path,
-    name_prefix=run_folder,
-)
-
-# Train
-mode = "Continuing" if CONTINUE_MODE else "Starting"
-print(f"{mode} {ALGO.upper()} training | {N_ENVS} envs | {TOTAL_TIMESTEPS:,} steps | Run: {run_folder}")
-
-try:
-    model.learn(
-        total_timesteps=TOTAL_TIMESTEPS,
-        callback=checkpoint_callback,
-        reset_num_timesteps=True,
-        progress_bar=True,
-        log_interval=LOG_INTERVAL
-    )
-    model.save(f"{checkpoint_path}/final_model")
-    print(f"Training complete. Model saved to {checkpoint_path}/final_model")
-except KeyboardInterrupt:
-    print("Training interrupted. Saving model...")
-    model.save(f"{checkpoint_path}/interrupted_model")
-finally:
-    env.close()
+def main():
+    os.makedirs(checkpoint_base, exist_ok=True)
+
+    run_folder = claim_run_folder()
+    checkpoint_path = os.path.join(checkpoint_base, run_folder)
+    os.makedirs(checkpoint_path, exist_ok=True)
+
+    # Create environment
+    if ALGO in ['ppo', 'a2c']:
+        env = make_dino_vec_env(N_ENVS, env_kwargs=env_kwargs, seed=SEED, vec_env=VEC_ENV, record_dir=RECORD_DIR)
+        env = VecMonitor(env)
+    else:
+        env = Monitor(gym.make('DinoRun-v0', **env_kwargs))
+        if RECORD_DIR:
+            env = TrajectoryRecorder(env, RECORD_DIR)
+
+    # Load every game page concurrently now rather than one by one on the first reset
+    prewarm_envs(env)
+
+    try:
+        # Model creation
+        models = {'ppo': PPO, 'a2c': A2C, 'dqn': DQN}
+        if ALGO not in models:
+            raise ValueError(f"Unknown algorithm: {ALGO}")
+
+        if CONTINUE_MODE:
+            model_file = input("Enter model file path: ").strip()
+            model = models[ALGO].load(model_file)
+            model.set_env(env)
+            model.tensorboard_log = tensorboard_base
+            print(f"Loaded {ALGO.upper()} model from: {model_file}")
+        else:
+            model_args = {
+                "policy": {'flat': "MlpPolicy", 'pixels': "CnnPolicy"}.get(OBS_MODE, "MultiInputPolicy"),
+                "env": env,
+                "verbose": VERBOSE,
+                "tensorboard_log": tensorboard_base,
+                "device": DEVICE,
+                "seed": SEED
+            }
+            if ALGO != 'dqn':
+                model_args["n_steps"] = N_STEPS
+            elif OBS_MODE == 'dict':
+                # Implicit next_obs, uint8 status and float16 fields: ~4x more transitions per GB
+                model_args["replay_buffer_class"] = DinoReplayBuffer
+            if ALGO == 'ppo':
+                model_args.update({"learning_rate": 5e-4, "batch_size": BATCH_SIZE, "ent_coef": ENT_COEF})
+
+            model = models[ALGO](**model_args)
+
+        # Log to the claimed folder; SB3 would pick its own ALGO_N
+        model.set_logger(configure(os.path.join(tensorboard_base, run_folder),
+                                   ["stdout", "tensorboard"] if VERBOSE >= 1 else ["tensorboard"]))
+
+        # Setup callbacks with matching path
+        checkpoint_callback = CheckpointCallback(
+            save_freq=25000,
+            save_path=checkpoint_path,
+            name_prefix=run_folder,
+        )
+        callback = checkpoint_callback
+        if PROFILE or PERF_INTERVAL:
+            # Per-phase env latencies and rollout/update time under timing/, renderer metrics under browser/
+            callback = CallbackList([checkpoint_callback, TimingCallback(log_freq=1000)])
+
+        # Train
+        mode = "Continuing" if CONTINUE_MODE else "Starting"
+        print(f"{mode} {ALGO.upper()} training | {N_ENVS} envs | {TOTAL_TIMESTEPS:,} steps | Run: {run_folder}")
+
+        try:
+            model.learn(
+                total_timesteps=TOTAL_TIMESTEPS,
+                callback=callback,
+                reset_num_timesteps=True,
+                progress_bar=True,
+                log_interval=LOG_INTERVAL
+            )
+            model.save(f"{checkpoint_path}/final_model")
+            print(f"Training complete. Model saved to {checkpoint_path}/final_model")
+        except KeyboardInterrupt:
+            print("Training interrupted. Saving model...")
+            model.save(f"{checkpoint_path}/interrupted_model")
+    finally:
+        env.close()
+
+
+# Spawned VEC_ENV=shm workers (the only start method on Windows) re-import this module
+if __name__ == "__main__":
+    main()
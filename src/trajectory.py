@@ -0,0 +1,172 @@
+import glob
+import json
+import os
+import tempfile
+import gymnasium as gym
+import numpy as np
+from gymnasium import spaces
+
+# Columns stored next to the observation(s) for every transition
+TRANSITION_COLUMNS = {
+    "action": ((), np.int64),
+    "reward": ((), np.float32),
+    "terminated": ((), np.bool_),
+    "truncated": ((), np.bool_),
+}
+
+
+def observation_columns(observation_space):
+    """Column name -> (shape, dtype) for an observation space; dict keys become ``obs.<key>``."""
+    if isinstance(observation_space, spaces.Dict):
+        return {f"obs.{key}": (space.shape, np.dtype(space.dtype))
+                for key, space in observation_space.spaces.items()}
+    return {"obs": (observation_space.shape, np.dtype(observation_space.dtype))}
+
+
+class TrajectoryRecorder(gym.Wrapper):
+    """Streams (obs, action, reward, terminated, truncated) transitions to memory-mapped .npy files.
+
+    Each wrapped env writes into its own directory under ``root``: one
+    ``chunk_NNNNN`` folder per ``chunk_size`` transitions holding one .npy file
+    per column, plus ``meta.json`` with the column layout and chunk lengths.
+    ``obs`` is the observation the action was taken in. Read the result back
+    with TrajectoryDataset.
+
+    ``meta.json`` is rewritten when a chunk opens and on every ``flush()``,
+    which runs each ``flush_every`` rows, so a killed run keeps all but its
+    last few transitions.
+    """
+
+    def __init__(self, env, root, chunk_size=65536, flush_every=4096):
+        super().__init__(env)
+        os.makedirs(root, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix="traj_", dir=root)
+        self.chunk_size = chunk_size
+        self.flush_every = flush_every
+        self.columns = dict(observation_columns(env.observation_space), **TRANSITION_COLUMNS)
+        self.chunks = []
+        self._arrays = None
+        self._row = 0
+        self._observation = None
+
+    def _open_chunk(self):
+        path = os.path.join(self.directory, f"chunk_{len(self.chunks):05d}")
+        os.makedirs(path)
+        self._arrays = {
+            name: np.lib.format.open_memmap(os.path.join(path, f"{name}.npy"), mode="w+",
+                                            dtype=dtype, shape=(self.chunk_size,) + tuple(shape))
+            for name, (shape, dtype) in self.columns.items()
+        }
+        self.chunks.append({"name": os.path.basename(path), "length": 0})
+        self._row = 0
+        self._write_meta()
+
+    def flush(self):
+        """Flush the open chunk to disk and record its current length in ``meta.json``."""
+        if self._arrays is None:
+            return
+        for array in self._arrays.values():
+            array.flush()
+        self.chunks[-1]["length"] = self._row
+        self._write_meta()
+
+    def _close_chunk(self):
+        self.flush()
+        self._arrays = None
+
+    def _write_meta(self):
+        meta = {
+            "chunk_size": self.chunk_size,
+            "columns": {name: {"shape": list(shape), "dtype": np.dtype(dtype).str}
+                        for name, (shape, dtype) in self.columns.items()},
+            "chunks": self.chunks,
+        }
+        # Replaced atomically: a run killed mid-write still leaves the previous meta
+        path = os.path.join(self.directory, "meta.json")
+        with open(path + ".tmp", "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def _write(self, action, reward, terminated, truncated):
+        if self._arrays is None:
+            self._open_chunk()
+        row = self._row
+        arrays = self._arrays
+        if isinstance(self._observation, dict):
+            for key, value in self._observation.items():
+                arrays[f"obs.{key}"][row] = value
+        else:
+            arrays["obs"][row] = self._observation
+        arrays["action"][row] = action
+        arrays["reward"][row] = reward
+        arrays["terminated"][row] = terminated
+        arrays["truncated"][row] = truncated
+        self._row += 1
+        if self._row == self.chunk_size:
+            self._close_chunk()
+        elif self.flush_every and self._row % self.flush_every == 0:
+            self.flush()
+
+    def reset(self, **kwargs):
+        observation, info = self.env.reset(**kwargs)
+        self._observation = observation
+        return observation, info
+
+    def step(self, action):
+        observation, reward, terminated, truncated, info = self.env.step(action)
+        self._write(action, reward, terminated, truncated)
+        self._observation = observation
+        return observation, reward, terminated, truncated, info
+
+    def close(self):
+        self._close_chunk()
+        super().close()
+
+
+class TrajectoryDataset:
+    """Reads every TrajectoryRecorder directory under ``root`` as memory-mapped columns.
+
+    Batches are slices of the memory maps, so nothing is copied until a batch
+    is used; a batch never spans two chunks.
+    """
+
+    def __init__(self, root):
+        self.chunks = []
+        for meta_path in sorted(glob.glob(os.path.join(root, "**", "meta.json"), recursive=True)):
+            directory = os.path.dirname(meta_path)
+            with open(meta_path) as f:
+                meta = json.load(f)
+            for chunk in meta["chunks"]:
+                if not chunk["length"]:
+                    continue
+                path = os.path.join(directory, chunk["name"])
+                columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")[:chunk["length"]]
+                           for name in meta["columns"]}
+                self.chunks.append(columns)
+
+    def __len__(self):
+        return sum(len(chunk["action"]) for chunk in self.chunks)
+
+    @staticmethod
+    def _batch(columns, start, end):
+        batch = {name: array[start:end] for name, array in columns.items() if not name.startswith("obs")}
+        if "obs" in columns:
+            batch["obs"] = columns["obs"][start:end]
+        else:
+            batch["obs"] = {name[4:]: array[start:end] for name, array in columns.items()
+                            if name.startswith("obs.")}
+        return batch
+
+    def iter_batches(self, batch_size=1024, shuffle=False, seed=None):
+        """Yield {obs, action, reward, terminated, truncated} batches of up to ``batch_size`` rows.
+
+        ``shuffle`` randomizes the order of the (contiguous) batches, not the rows
+        within them.
+        """
+        slices = [(i, start, min(start + batch_size, len(chunk["action"])))
+                  for i, chunk in enumerate(self.chunks)
+                  for start in range(0, len(chunk["action"]), batch_size)]
+        if shuffle:
+            np.random.default_rng(seed).shuffle(slices)
+        for i, start, end in slices:
+            yield self._batch(self.chunks[i], start, end)